@@ -12,7 +12,7 @@ import sys
 import os
 import subprocess
 import shutil
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
 from PySide6.QtWidgets import (
@@ -22,8 +22,45 @@ from PySide6.QtWidgets import (
     QMessageBox, QFileDialog, QGroupBox, QStatusBar, QMenuBar, QMenu,
     QHeaderView, QAbstractItemView
 )
-from PySide6.QtCore import Qt, QThread, Signal, QTimer
-from PySide6.QtGui import QIcon, QFont, QAction
+from PySide6.QtCore import Qt, QThread, Signal, QTimer, QUrl
+from PySide6.QtGui import QIcon, QFont, QAction, QDesktopServices
+
+# Optional in-process access to the borg library (no borg fork per listing)
+try:
+    from borg.repository import Repository as BorgRepository
+    try:
+        from borg.manifest import Manifest as BorgManifest
+    except ImportError:
+        from borg.helpers import Manifest as BorgManifest
+    BORG_LIBRARY_AVAILABLE = True
+except ImportError:
+    BORG_LIBRARY_AVAILABLE = False
+
+# Role holding raw (numeric) values used for column sorting
+SORT_ROLE = Qt.UserRole + 1
+# Role marking the ".." row, which stays on top whichever way the table is sorted
+PIN_ROLE = Qt.UserRole + 2
+
+class SortableTableItem(QTableWidgetItem):
+    """Table item that sorts by its SORT_ROLE value instead of display text"""
+    
+    def __lt__(self, other):
+        pinned = bool(self.data(PIN_ROLE))
+        other_pinned = bool(other.data(PIN_ROLE))
+        if pinned or other_pinned:
+            if pinned and other_pinned:
+                return False
+            # Descending sorts swap the comparison, so the pinned row must then compare greater
+            table = self.tableWidget()
+            descending = table is not None and table.horizontalHeader().sortIndicatorOrder() == Qt.DescendingOrder
+            return pinned != descending
+        
+        key = self.data(SORT_ROLE)
+        other_key = other.data(SORT_ROLE)
+        if key is None or other_key is None:
+            # Compare text directly; super().__lt__ re-enters this override under PySide6
+            return self.text() < other.text()
+        return key < other_key
 
 class BorgWorker(QThread):
     """Background worker for Borg operations"""
@@ -47,6 +84,8 @@ class BorgWorker(QThread):
                 self.unmount_archive()
             elif self.operation == "list_files":
                 self.list_files(self.args[0])
+            elif self.operation == "preview":
+                self.preview_file(self.args[0])
         except Exception as e:
             self.finished.emit(self.operation, None, str(e))
     
@@ -54,6 +93,14 @@ class BorgWorker(QThread):
         """Get list of all backup archives"""
         self.progress.emit("Loading backup archives...")
         
+        if BORG_LIBRARY_AVAILABLE:
+            try:
+                archives = self.list_archives_in_process()
+                self.finished.emit("list_archives", archives, "")
+                return
+            except Exception:
+                pass  # Fall back to the borg command line
+        
         try:
             result = subprocess.run(
                 ['bash', '-c', f'echo "y" | borg list "{self.repo_path}"'],
@@ -84,6 +131,26 @@ class BorgWorker(QThread):
         except Exception as e:
             self.finished.emit("list_archives", None, str(e))
     
+    def list_archives_in_process(self):
+        """Read the archive list through the borg library without forking borg"""
+        archives = []
+        with BorgRepository(self.repo_path, exclusive=False) as repository:
+            loaded = BorgManifest.load(repository, (BorgManifest.Operation.READ,))
+            manifest = loaded[0] if isinstance(loaded, tuple) else loaded
+            
+            for info in manifest.archives.list(sort_by=['ts']):
+                ts = info.ts if info.ts.tzinfo else info.ts.replace(tzinfo=timezone.utc)
+                date_str = ts.astimezone().strftime("%Y-%m-%d %H:%M:%S")
+                archives.append({
+                    'name': info.name,
+                    'date': date_str,
+                    'readable_date': self.format_date(date_str)
+                })
+        
+        # Most recent first
+        archives.reverse()
+        return archives
+    
     def mount_archive(self, archive_name):
         """Mount a specific archive"""
         self.progress.emit(f"Mounting archive {archive_name}...")
@@ -137,7 +204,9 @@ class BorgWorker(QThread):
                     'name': '..',
                     'is_dir': True,
                     'size': '',
+                    'size_bytes': -1,
                     'date': '',
+                    'mtime': 0.0,
                     'path': os.path.dirname(path)
                 })
             
@@ -149,9 +218,12 @@ class BorgWorker(QThread):
                 item_path = os.path.join(path, item)
                 is_dir = os.path.isdir(item_path)
                 
+                size_bytes = -1
+                mtime = 0.0
                 try:
                     stat = os.stat(item_path)
-                    date = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M")
+                    mtime = stat.st_mtime
+                    date = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M")
                     
                     if is_dir:
                         size = "Folder"
@@ -173,7 +245,9 @@ class BorgWorker(QThread):
                     'name': item,
                     'is_dir': is_dir,
                     'size': size,
+                    'size_bytes': size_bytes,
                     'date': date,
+                    'mtime': mtime,
                     'path': item_path
                 })
             
@@ -182,13 +256,39 @@ class BorgWorker(QThread):
         except Exception as e:
             self.finished.emit("list_files", None, str(e))
     
+    def preview_file(self, path):
+        """Read the start of a file for the preview pane"""
+        try:
+            with open(path, 'rb') as f:
+                file_size = os.fstat(f.fileno()).st_size
+                
+                if file_size > 1024 * 1024:  # 1MB limit
+                    content = f"File too large to preview ({file_size/1024/1024:.1f} MB)"
+                    self.finished.emit("preview", (content, False), "")
+                    return
+                
+                data = f.read(5000)  # First 5000 bytes
+            
+            content = data.decode('utf-8', errors='ignore')
+            self.finished.emit("preview", (content, len(data) == 5000), "")
+            
+        except Exception as e:
+            self.finished.emit("preview", None, str(e))
+    
     def format_date(self, date_str):
         """Format date string for display"""
         try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-            return dt.strftime("%B %d, %Y at %I:%M %p")
+            # Fixed "YYYY-MM-DD HH:MM:SS" layout, sliced directly (much faster than strptime)
+            dt = datetime(
+                int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+                int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19])
+            )
         except:
-            return date_str
+            try:
+                dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
+            except:
+                return date_str
+        return dt.strftime("%B %d, %Y at %I:%M %p")
 
 class PikaBackupExplorer(QMainWindow):
     def __init__(self):
@@ -198,10 +298,15 @@ class PikaBackupExplorer(QMainWindow):
         self.mount_point = "/home/herb/desktop-backup-mount"
         self.recovery_path = str(Path.home() / "Desktop" / "RecoveredFiles")
         self.temp_path = str(Path.home() / "Desktop" / "TempPreview")
+        self.tree_id = 0
+        self.background_workers = set()
+        self._preview_id = 0
+        
+        # Recovery directories are created on first use
+        self._ready_dirs = set()
         
-        # Create recovery directories
-        os.makedirs(self.recovery_path, exist_ok=True)
-        os.makedirs(self.temp_path, exist_ok=True)
+        # Directory listings keyed by path -> (st_mtime_ns, files); archives are read-only
+        self._dir_cache = {}
         
         self.init_ui()
         self.load_archives()
@@ -259,6 +364,7 @@ class PikaBackupExplorer(QMainWindow):
         self.dir_tree = QTreeWidget()
         self.dir_tree.setHeaderLabels(["📂 Folders"])
         self.dir_tree.itemClicked.connect(self.on_folder_clicked)
+        self.dir_tree.itemExpanded.connect(self.on_tree_expanded)
         nav_layout.addWidget(self.dir_tree)
         
         splitter.addWidget(nav_group)
@@ -276,13 +382,26 @@ class PikaBackupExplorer(QMainWindow):
         search_layout.addWidget(self.search_edit)
         files_layout.addLayout(search_layout)
         
+        # Debounce search so the table is filtered once typing pauses
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        
         # File table
         self.file_table = QTableWidget()
         self.file_table.setColumnCount(4)
         self.file_table.setHorizontalHeaderLabels(["Name", "Date Modified", "Size", "Actions"])
         self.file_table.horizontalHeader().setStretchLastSection(True)
+        self.file_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Interactive)
+        self.file_table.setColumnWidth(0, 420)
+        self.file_table.setColumnWidth(1, 140)
+        self.file_table.setColumnWidth(2, 100)
         self.file_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.file_table.setAlternatingRowColors(True)
+        # The default indicator is column 0 descending; start A-Z by name
+        self.file_table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        self.file_table.setSortingEnabled(True)
         self.file_table.itemDoubleClicked.connect(self.on_file_double_clicked)
         files_layout.addWidget(self.file_table)
         
@@ -407,6 +526,7 @@ class PikaBackupExplorer(QMainWindow):
         
         self.current_archive = result
         self.current_path = os.path.join(self.mount_point, "home/herb")
+        self._dir_cache.clear()
         self.unmount_btn.setEnabled(True)
         
         # Build directory tree
@@ -421,6 +541,7 @@ class PikaBackupExplorer(QMainWindow):
     def build_directory_tree(self):
         """Build directory tree structure"""
         self.dir_tree.clear()
+        self.tree_id += 1
         
         if not self.current_archive:
             return
@@ -435,22 +556,49 @@ class PikaBackupExplorer(QMainWindow):
         
         for dir_name in common_dirs:
             dir_path = os.path.join(root_path, dir_name)
-            if os.path.exists(dir_path) and os.path.isdir(dir_path):
-                dir_item = QTreeWidgetItem(root_item, [dir_name])
-                dir_item.setData(0, Qt.UserRole, dir_path)
-                
-                # Check if directory has subdirectories
-                try:
-                    for sub_item in os.listdir(dir_path):
-                        sub_path = os.path.join(dir_path, sub_item)
-                        if os.path.isdir(sub_path) and not sub_item.startswith('.'):
-                            sub_dir_item = QTreeWidgetItem(dir_item, [sub_item])
-                            sub_dir_item.setData(0, Qt.UserRole, sub_path)
-                except:
-                    pass
+            if os.path.isdir(dir_path):
+                self.add_tree_folder(root_item, dir_name, dir_path)
         
         self.dir_tree.expandItem(root_item)
     
+    def add_tree_folder(self, parent_item, name, path):
+        """Add a folder to the tree with a placeholder child for lazy loading"""
+        dir_item = QTreeWidgetItem(parent_item, [name])
+        dir_item.setData(0, Qt.UserRole, path)
+        
+        # Placeholder (no path data) so the folder shows an expand arrow
+        QTreeWidgetItem(dir_item, [""])
+        return dir_item
+    
+    def on_tree_expanded(self, item):
+        """Load subfolders the first time a tree folder is expanded"""
+        if item.childCount() != 1 or item.child(0).data(0, Qt.UserRole) is not None:
+            return
+        
+        worker = BorgWorker("list_files", item.data(0, Qt.UserRole))
+        worker.finished.connect(
+            lambda operation, files, error, item=item, worker=worker, tree_id=self.tree_id:
+                self.on_tree_folders_loaded(item, worker, tree_id, files, error)
+        )
+        self.background_workers.add(worker)
+        worker.start()
+    
+    def on_tree_folders_loaded(self, item, worker, tree_id, files, error):
+        """Replace a folder's placeholder with its real subfolders"""
+        self.background_workers.discard(worker)
+        
+        # Tree was rebuilt or cleared while loading
+        if tree_id != self.tree_id:
+            return
+        
+        item.takeChildren()
+        if error or not files:
+            return
+        
+        for file_info in files:
+            if file_info['is_dir'] and file_info['name'] != '..':
+                self.add_tree_folder(item, file_info['name'], file_info['path'])
+    
     def on_folder_clicked(self, item, column):
         """Handle folder click in tree"""
         folder_path = item.data(0, Qt.UserRole)
@@ -471,20 +619,40 @@ class PikaBackupExplorer(QMainWindow):
     
     def load_files(self, path):
         """Load files from specified path"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        
+        # Revisited directory: serve the cached listing
+        cached = self._dir_cache.get(path)
+        if mtime is not None and cached and cached[0] == mtime:
+            self.on_files_loaded("list_files", cached[1], "")
+            return
+        
         self.status_bar.showMessage(f"Loading files from {path}...")
         
         self.worker = BorgWorker("list_files", path)
+        self.worker.finished.connect(
+            lambda operation, files, error: self.cache_files(path, mtime, files, error)
+        )
         self.worker.finished.connect(self.on_files_loaded)
         self.worker.progress.connect(self.status_bar.showMessage)
         self.worker.start()
     
+    def cache_files(self, path, mtime, files, error):
+        """Remember a directory listing for later visits"""
+        if mtime is not None and files is not None and not error:
+            self._dir_cache[path] = (mtime, files)
+    
     def on_files_loaded(self, operation, files, error):
         """Handle files loading completion"""
         if error:
             QMessageBox.warning(self, "Warning", f"Error loading files: {error}")
             return
         
-        # Clear and populate table
+        # Clear and populate table (sorting off so rows stay where inserted)
+        self.file_table.setSortingEnabled(False)
         self.file_table.setRowCount(0)
         
         for file_info in files:
@@ -492,22 +660,29 @@ class PikaBackupExplorer(QMainWindow):
             self.file_table.insertRow(row)
             
             # Name
-            name_item = QTableWidgetItem(f"{'📁' if file_info['is_dir'] else '📄'} {file_info['name']}")
+            name_item = SortableTableItem(f"{'📁' if file_info['is_dir'] else '📄'} {file_info['name']}")
             name_item.setData(Qt.UserRole, file_info)
             self.file_table.setItem(row, 0, name_item)
             
             # Date
-            self.file_table.setItem(row, 1, QTableWidgetItem(file_info['date']))
+            date_item = SortableTableItem(file_info['date'])
+            date_item.setData(SORT_ROLE, file_info['mtime'])
+            self.file_table.setItem(row, 1, date_item)
             
             # Size
-            self.file_table.setItem(row, 2, QTableWidgetItem(file_info['size']))
+            size_item = SortableTableItem(file_info['size'])
+            size_item.setData(SORT_ROLE, file_info['size_bytes'])
+            self.file_table.setItem(row, 2, size_item)
+            
+            if file_info['name'] == '..':
+                for pinned_item in (name_item, date_item, size_item):
+                    pinned_item.setData(PIN_ROLE, True)
             
             # Actions (will be handled by buttons)
             actions_text = "Navigate" if file_info['is_dir'] else "Copy/Preview"
             self.file_table.setItem(row, 3, QTableWidgetItem(actions_text))
         
-        # Resize columns
-        self.file_table.resizeColumnsToContents()
+        self.file_table.setSortingEnabled(True)
         
         self.status_bar.showMessage(f"Loaded {len(files)} items")
     
@@ -585,23 +760,35 @@ class PikaBackupExplorer(QMainWindow):
     
     def preview_file(self, file_info):
         """Preview a file in the preview pane"""
-        try:
-            file_path = file_info['path']
-            file_size = os.path.getsize(file_path)
-            
-            if file_size > 1024 * 1024:  # 1MB limit
-                content = f"File too large to preview ({file_size/1024/1024:.1f} MB)"
-            else:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read(5000)  # First 5000 characters
-                    if len(content) == 5000:
-                        content += "\n\n... (showing first 5,000 characters)"
-            
-            self.preview_text.setText(content)
-            self.status_bar.showMessage(f"Previewing: {file_info['name']}")
-            
-        except Exception as e:
-            self.preview_text.setText(f"Error previewing file: {e}")
+        # Newer previews supersede any still in flight
+        self._preview_id += 1
+        self.preview_text.setText("Loading...")
+        
+        worker = BorgWorker("preview", file_info['path'])
+        worker.finished.connect(
+            lambda operation, result, error, worker=worker, preview_id=self._preview_id:
+                self.on_preview_loaded(worker, preview_id, file_info, result, error)
+        )
+        self.background_workers.add(worker)
+        worker.start()
+    
+    def on_preview_loaded(self, worker, preview_id, file_info, result, error):
+        """Show preview text once the background read completes"""
+        self.background_workers.discard(worker)
+        
+        if preview_id != self._preview_id:
+            return
+        
+        if error:
+            self.preview_text.setText(f"Error previewing file: {error}")
+            return
+        
+        content, truncated = result
+        if truncated:
+            content += "\n\n... (showing first 5,000 bytes)"
+        
+        self.preview_text.setText(content)
+        self.status_bar.showMessage(f"Previewing: {file_info['name']}")
     
     def temp_copy_selected_file(self):
         """Copy selected file to temp folder"""
@@ -618,6 +805,7 @@ class PikaBackupExplorer(QMainWindow):
     def copy_file(self, file_info, dest_folder, folder_type):
         """Copy file to specified folder"""
         try:
+            self._ensure_dir(dest_folder)
             src_path = file_info['path']
             filename = file_info['name']
             dest_path = os.path.join(dest_folder, filename)
@@ -639,15 +827,27 @@ class PikaBackupExplorer(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to copy file: {e}")
     
+    def _ensure_dir(self, path):
+        """Create a directory the first time it is needed"""
+        if path not in self._ready_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._ready_dirs.add(path)
+    
     def open_temp_folder(self):
         """Open temp folder in file manager"""
-        subprocess.run(['nautilus', self.temp_path], check=False)
+        self._ensure_dir(self.temp_path)
+        QDesktopServices.openUrl(QUrl.fromLocalFile(self.temp_path))
     
     def open_recovery_folder(self):
         """Open recovery folder in file manager"""
-        subprocess.run(['nautilus', self.recovery_path], check=False)
+        self._ensure_dir(self.recovery_path)
+        QDesktopServices.openUrl(QUrl.fromLocalFile(self.recovery_path))
     
     def filter_files(self):
+        """Schedule a filter pass once typing pauses"""
+        self._filter_timer.start()
+    
+    def _apply_filter(self):
         """Filter files based on search text"""
         search_text = self.search_edit.text().lower()
         
@@ -673,9 +873,11 @@ class PikaBackupExplorer(QMainWindow):
         self.current_archive = None
         self.current_path = None
         self.unmount_btn.setEnabled(False)
+        self._dir_cache.clear()
         
         # Clear interface
         self.dir_tree.clear()
+        self.tree_id += 1
         self.file_table.setRowCount(0)
         self.preview_text.clear()
         self.path_label.setText("No archive mounted")
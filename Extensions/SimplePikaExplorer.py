@@ -10,64 +10,212 @@ Simple PySide6 Backup Explorer - Basic version that should work reliably
 
 import sys
 import os
+import json
 import subprocess
 import shutil
+import time
+import threading
+from collections import deque
 from datetime import datetime
 
 try:
     from PySide6.QtWidgets import (
         QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-        QListWidget, QTableWidget, QTableWidgetItem, QLabel, QPushButton,
+        QListWidget, QListWidgetItem, QTableView, QLabel, QPushButton,
         QComboBox, QMessageBox, QTextEdit, QSplitter, QAbstractItemView
     )
-    from PySide6.QtCore import Qt, QThread, Signal
+    from PySide6.QtCore import (
+        Qt, QObject, QRunnable, QThreadPool, QTimer, Signal, QAbstractTableModel, QModelIndex
+    )
 except ImportError:
     print("PySide6 not available. Please install with: pip install PySide6")
     sys.exit(1)
 
-class SimpleBackupWorker(QThread):
-    """Simple worker for basic operations"""
+REPO_PATH = "/media/herb/Linux_Drive_2/PikaBackups/From_2502-07-11"
+
+# Answers borg's repository access prompts without a shell pipe
+BORG_ENV = {
+    **os.environ,
+    'BORG_UNKNOWN_UNENCRYPTED_REPO_ACCESS_IS_OK': 'yes',
+    'BORG_RELOCATED_REPO_ACCESS_IS_OK': 'yes'
+}
+
+# Archive list persisted between runs, validated against the repository index mtime
+ARCHIVE_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "pikapeek", "archives.json")
+
+# Streaming of directory listings: rows per batch and max seconds a partial batch waits
+BATCH_SIZE = 500
+BATCH_MAX_WAIT = 0.05
+
+# Size units, indexed by (bit_length - 1) // 10, and date layout used for every listed entry
+_UNITS = (('B', 1), ('KB', 1024), ('MB', 1024 ** 2), ('GB', 1024 ** 3))
+_DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+# Buffer for copies that cannot be done in the kernel
+COPY_BUFSIZE = 4 * 1024 * 1024
+
+def fast_copy(src, dst):
+    """Copy a file in the kernel where possible, preserving metadata like shutil.copy2"""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            if not hasattr(os, 'copy_file_range'):
+                raise OSError("copy_file_range not available")
+            while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30) > 0:
+                pass
+        except OSError:
+            # e.g. FUSE source or cross-device copy: fall back to a large-buffer copy
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, COPY_BUFSIZE)
+    shutil.copystat(src, dst)
+    return dst
+
+def scan_entries(path):
+    """Return the visible entries of a directory, sorted by name"""
+    # scandir returns type info with the names, saving a stat per entry
+    with os.scandir(path) as it:
+        return sorted((e for e in it if not e.name.startswith('.')), key=lambda e: e.name)
+
+def _format_size(size_bytes):
+    """Format a byte count with the largest unit it reaches"""
+    idx = min((size_bytes.bit_length() - 1) // 10, 3) if size_bytes else 0
+    if idx == 0:
+        return f"{size_bytes} B"
+    unit, divisor = _UNITS[idx]
+    return f"{size_bytes / divisor:.1f} {unit}"
+
+def describe_entry(entry):
+    """Build the file table row for a directory entry"""
+    is_dir = entry.is_dir(follow_symlinks=False)
+    
+    try:
+        stat = entry.stat(follow_symlinks=False)
+        date = datetime.fromtimestamp(stat.st_mtime).strftime(_DATE_FORMAT)
+        
+        if is_dir:
+            size = "Folder"
+        else:
+            size = _format_size(stat.st_size)
+    except OSError:
+        date = "Unknown"
+        size = "Unknown"
+    
+    return {
+        'name': entry.name,
+        'is_dir': is_dir,
+        'size': size,
+        'date': date,
+        'path': entry.path
+    }
+
+def repo_index_mtime(repo_path):
+    """Newest mtime of the repository's index, hints and config files, or None"""
+    # Not the repository directory: borg adds and removes its lock files there on every command
+    try:
+        with os.scandir(repo_path) as it:
+            mtimes = [entry.stat().st_mtime_ns for entry in it
+                      if entry.name.startswith(('index.', 'hints.')) or entry.name == 'config']
+    except OSError:
+        return None
+    return max(mtimes, default=None)
+
+def load_archive_cache(repo_path):
+    """Return the cached archive list entry for a repository, or None"""
+    try:
+        with open(ARCHIVE_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('repo_path') == repo_path:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return None
+
+def save_archive_cache(repo_path, repo_mtime, archives):
+    """Persist the archive list for the next start"""
+    try:
+        os.makedirs(os.path.dirname(ARCHIVE_CACHE_FILE), exist_ok=True)
+        tmp_path = ARCHIVE_CACHE_FILE + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'repo_path': repo_path, 'repo_mtime': repo_mtime, 'archives': archives}, f)
+        os.replace(tmp_path, ARCHIVE_CACHE_FILE)
+    except OSError:
+        pass
+
+class WorkerSignals(QObject):
+    """Signals for SimpleBackupTask (QRunnable cannot emit signals itself)"""
     finished = Signal(str, object)  # operation, result
+    batch = Signal(list)  # partial directory listing
+
+class SimpleBackupTask(QRunnable):
+    """Simple thread pool task for basic operations"""
     
     def __init__(self, operation, *args):
         super().__init__()
         self.operation = operation
         self.args = args
-        self.repo_path = "/media/herb/Linux_Drive_2/PikaBackups/From_2502-07-11"
+        self.repo_path = REPO_PATH
+        self.cancel = threading.Event()
+        self.signals = WorkerSignals()
     
     def run(self):
         try:
             if self.operation == "list_archives":
                 result = self.list_archives()
-                self.finished.emit("list_archives", result)
+                self.signals.finished.emit("list_archives", result)
             elif self.operation == "list_files":
                 result = self.list_files(self.args[0])
-                self.finished.emit("list_files", result)
+                self.signals.finished.emit("list_files", result)
         except Exception as e:
-            self.finished.emit(self.operation, f"Error: {e}")
+            self.signals.finished.emit(self.operation, f"Error: {e}")
     
     def list_archives(self):
         """Get backup archives"""
         try:
-            result = subprocess.run(
-                ['bash', '-c', f'echo "y" | borg list "{self.repo_path}"'],
-                capture_output=True, text=True, check=False, timeout=30
-            )
+            # Repository unchanged since the last run: reuse the cached list
+            repo_mtime = repo_index_mtime(self.repo_path)
+            cache = load_archive_cache(self.repo_path)
+            if repo_mtime is not None and cache and cache.get('repo_mtime') == repo_mtime:
+                return cache['archives']
             
-            if result.returncode != 0:
-                return f"Error: {result.stderr}"
+            # One tab-separated line per archive, read as borg writes them
+            process = subprocess.Popen(
+                ['borg', 'list', '--format', '{archive}{TAB}{time}{NL}', self.repo_path],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1, env=BORG_ENV
+            )
+            killer = threading.Timer(30, process.kill)
+            killer.start()
+            try:
+                archives = []
+                chunk = []
+                last_emit = 0.0  # The first archive is sent on its own
+                for line in process.stdout:
+                    # "time" ends in "2025-07-11 05:58:09"
+                    name, _, archive_time = line.rstrip('\n').partition('\t')
+                    chunk.append({'name': name, 'date': archive_time[-19:]})
+                    
+                    now = time.monotonic()
+                    if len(chunk) >= BATCH_SIZE or now - last_emit >= BATCH_MAX_WAIT:
+                        archives.extend(chunk)
+                        self.signals.batch.emit(chunk)
+                        chunk = []
+                        last_emit = now
+                
+                if chunk:
+                    archives.extend(chunk)
+                    self.signals.batch.emit(chunk)
+                
+                stderr = process.stderr.read()
+                process.wait()
+            finally:
+                killer.cancel()
             
-            archives = []
-            for line in result.stdout.strip().split('\n'):
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        archives.append({
-                            'name': parts[0],
-                            'date': f"{parts[2]} {parts[3]}"
-                        })
+            if process.returncode != 0:
+                return f"Error: {stderr}"
             
-            return list(reversed(archives))  # Most recent first
+            archives.reverse()  # Most recent first
+            save_archive_cache(self.repo_path, repo_mtime, archives)
+            return archives
             
         except Exception as e:
             return f"Error: {e}"
@@ -79,44 +227,195 @@ class SimpleBackupWorker(QThread):
                 return f"Path not found: {path}"
             
             files = []
-            for item in sorted(os.listdir(path)):
-                if item.startswith('.'):
-                    continue
+            chunk = []
+            last_emit = time.monotonic()
+            for i, entry in enumerate(scan_entries(path)):
+                # Stop early once a newer listing has been requested
+                if i % 256 == 0 and self.cancel.is_set():
+                    return None
                 
-                item_path = os.path.join(path, item)
-                is_dir = os.path.isdir(item_path)
-                
-                try:
-                    stat = os.stat(item_path)
-                    date = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M")
-                    
-                    if is_dir:
-                        size = "Folder"
-                    else:
-                        size_bytes = stat.st_size
-                        if size_bytes < 1024:
-                            size = f"{size_bytes} B"
-                        elif size_bytes < 1024*1024:
-                            size = f"{size_bytes/1024:.1f} KB"
-                        else:
-                            size = f"{size_bytes/(1024*1024):.1f} MB"
-                except:
-                    date = "Unknown"
-                    size = "Unknown"
+                chunk.append(describe_entry(entry))
                 
-                files.append({
-                    'name': item,
-                    'is_dir': is_dir,
-                    'size': size,
-                    'date': date,
-                    'path': item_path
-                })
+                # Hand rows to the UI as they are ready
+                now = time.monotonic()
+                if len(chunk) >= BATCH_SIZE or now - last_emit >= BATCH_MAX_WAIT:
+                    files.extend(chunk)
+                    self.signals.batch.emit(chunk)
+                    chunk = []
+                    last_emit = now
+            
+            if chunk:
+                files.extend(chunk)
+                self.signals.batch.emit(chunk)
             
             return files
             
         except Exception as e:
             return f"Error: {e}"
 
+class IndexSignals(QObject):
+    """Signals for BuildIndexTask"""
+    indexed = Signal(str, object, list)  # directory path, st_mtime_ns, rows
+    finished = Signal()
+
+class BuildIndexTask(QRunnable):
+    """Thread pool task pre-listing a mounted archive breadth-first"""
+    
+    def __init__(self, root_path, max_depth=3):
+        super().__init__()
+        self.root_path = root_path
+        self.max_depth = max_depth
+        self.cancel = threading.Event()
+        self.done = threading.Event()
+        self.signals = IndexSignals()
+    
+    def run(self):
+        try:
+            self.walk()
+        finally:
+            self.done.set()
+        self.signals.finished.emit()
+    
+    def walk(self):
+        try:
+            mtimes = {self.root_path: os.stat(self.root_path).st_mtime_ns}
+        except OSError:
+            return
+        
+        queue = deque([(self.root_path, 0)])
+        while queue and not self.cancel.is_set():
+            path, depth = queue.popleft()
+            mtime = mtimes.pop(path)
+            
+            try:
+                entries = scan_entries(path)
+                rows = [describe_entry(entry) for entry in entries]
+            except OSError:
+                continue
+            
+            self.signals.indexed.emit(path, mtime, rows)
+            
+            if depth < self.max_depth:
+                for entry, row in zip(entries, rows):
+                    if row['is_dir']:
+                        try:
+                            # Cached by scandir, no extra syscall
+                            mtimes[entry.path] = entry.stat(follow_symlinks=False).st_mtime_ns
+                        except OSError:
+                            continue
+                        queue.append((entry.path, depth + 1))
+
+class CopySignals(QObject):
+    """Signals for CopyTask"""
+    progress = Signal(int, int)  # items done, total
+    finished = Signal(int, list)  # items copied, error messages
+
+class CopyTask(QRunnable):
+    """Thread pool task copying items out of the mounted archive"""
+    
+    def __init__(self, items, dest_dir):
+        super().__init__()
+        self.items = items
+        self.dest_dir = dest_dir
+        self.signals = CopySignals()
+    
+    def run(self):
+        copied = 0
+        errors = []
+        total = len(self.items)
+        last_emit = time.monotonic()
+        
+        # Names already taken in the destination, read once
+        try:
+            with os.scandir(self.dest_dir) as it:
+                existing = {entry.name for entry in it}
+        except OSError:
+            existing = set()
+        
+        for done, item_info in enumerate(self.items, 1):
+            try:
+                self.copy_item(item_info, existing)
+                copied += 1
+            except Exception as e:
+                errors.append(f"{item_info['name']}: {e}")
+            
+            # Throttle progress so runs of small files share one update
+            now = time.monotonic()
+            if done == total or now - last_emit >= BATCH_MAX_WAIT:
+                self.signals.progress.emit(done, total)
+                last_emit = now
+        
+        self.signals.finished.emit(copied, errors)
+    
+    def copy_item(self, item_info, existing):
+        """Copy file or directory to destination, picking a name not in existing"""
+        src_path = item_info['path']
+        item_name = item_info['name']
+        
+        # Handle duplicates
+        name = item_name
+        counter = 1
+        base_name, ext = os.path.splitext(item_name)
+        while name in existing:
+            name = f"{base_name}_{counter}{ext}"
+            counter += 1
+        existing.add(name)
+        dest_path = os.path.join(self.dest_dir, name)
+        
+        if item_info['is_dir']:
+            shutil.copytree(src_path, dest_path, copy_function=fast_copy)
+        else:
+            fast_copy(src_path, dest_path)
+
+class FileTableModel(QAbstractTableModel):
+    """Listing rows for the file view; cells are produced only when painted"""
+    HEADERS = ("Name", "Date", "Size")
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.files = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.files)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        file_info = self.files[index.row()]
+        if role == Qt.DisplayRole:
+            column = index.column()
+            if column == 0:
+                icon = "📁" if file_info['is_dir'] else "📄"
+                return f"{icon} {file_info['name']}"
+            return file_info['date'] if column == 1 else file_info['size']
+        if role == Qt.UserRole:
+            return file_info
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def clear(self):
+        """Drop all rows"""
+        self.beginResetModel()
+        self.files = []
+        self.endResetModel()
+    
+    def append_files(self, files):
+        """Append a batch of rows with a single insert notification"""
+        if not files:
+            return
+        start = len(self.files)
+        self.beginInsertRows(QModelIndex(), start, start + len(files) - 1)
+        self.files.extend(files)
+        self.endInsertRows()
+
 class SimplePikaExplorer(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -125,13 +424,33 @@ class SimplePikaExplorer(QMainWindow):
         self.temp_path = "/home/herb/Desktop/TempPreview"
         self.current_archive = None
         self.current_path = None
+        self.archives = None
+        self._archives_streaming = False
         
-        # Create directories
-        os.makedirs(self.recovery_path, exist_ok=True)
-        os.makedirs(self.temp_path, exist_ok=True)
+        # Directory listings keyed by (archive, path) -> (st_mtime_ns, files)
+        self._dir_cache = {}
+        
+        # Reused worker threads; the token identifies the latest directory listing
+        self.pool = QThreadPool.globalInstance()
+        self._tasks = set()
+        self._current_token = 0
+        self.copy_running = False
+        self.index_task = None
+        self.files_task = None
+        
+        # Tracked mount state; checked against the filesystem once, here
+        self._mounted = os.path.ismount(self.mount_point)
         
         self.init_ui()
-        self.load_archives()
+        
+        # Let the window paint before touching the disk or spawning borg
+        QTimer.singleShot(0, self._ensure_dirs)
+        QTimer.singleShot(0, self.load_archives)
+    
+    def _ensure_dirs(self):
+        """Create the copy destination directories"""
+        os.makedirs(self.recovery_path, exist_ok=True)
+        os.makedirs(self.temp_path, exist_ok=True)
     
     def init_ui(self):
         """Initialize simple UI"""
@@ -157,7 +476,7 @@ class SimplePikaExplorer(QMainWindow):
             QPushButton:pressed {
                 background-color: #5E81AC;
             }
-            QListWidget, QTableWidget {
+            QListWidget, QTableView {
                 color: #ECEFF4;
                 background-color: #3B4252;
                 border: 1px solid #4C566A;
@@ -168,7 +487,7 @@ class SimplePikaExplorer(QMainWindow):
                 padding: 4px;
                 border: 1px solid #4C566A;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #88C0D0;
                 color: #2E3440;
             }
@@ -186,7 +505,7 @@ class SimplePikaExplorer(QMainWindow):
         
         self.archive_combo = QComboBox()
         self.archive_combo.setMinimumWidth(400)
-        self.archive_combo.currentTextChanged.connect(self.on_archive_selected)
+        self.archive_combo.currentIndexChanged.connect(self.on_archive_selected)
         controls_layout.addWidget(self.archive_combo)
         
         self.mount_btn = QPushButton("🔗 Mount")
@@ -227,11 +546,12 @@ class SimplePikaExplorer(QMainWindow):
         self.path_label = QLabel("No archive mounted")
         right_layout.addWidget(self.path_label)
         
-        self.file_table = QTableWidget()
-        self.file_table.setColumnCount(3)
-        self.file_table.setHorizontalHeaderLabels(["Name", "Date", "Size"])
-        self.file_table.itemDoubleClicked.connect(self.on_file_double_clicked)
+        self.file_model = FileTableModel(self)
+        self.file_table = QTableView()
+        self.file_table.setModel(self.file_model)
+        self.file_table.doubleClicked.connect(self.on_file_double_clicked)
         self.file_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.file_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         right_layout.addWidget(self.file_table)
         
         # File actions
@@ -263,29 +583,68 @@ class SimplePikaExplorer(QMainWindow):
         layout.addWidget(splitter)
         
         # Selection handler
-        self.file_table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.file_table.selectionModel().selectionChanged.connect(self.on_selection_changed)
     
     def load_archives(self):
         """Load backup archives"""
         self.status_label.setText("Loading backup archives...")
         
-        self.worker = SimpleBackupWorker("list_archives")
-        self.worker.finished.connect(self.on_archives_loaded)
-        self.worker.start()
+        # Show the last known archives right away; the worker revalidates them
+        cache = load_archive_cache(REPO_PATH)
+        if cache:
+            self.on_archives_loaded("list_archives", cache['archives'])
+        else:
+            # Nothing to show yet: fill the combo as borg lists archives
+            self.archives = []
+            self.archive_combo.clear()
+            self.archive_combo.addItem("Select backup date...", None)
+            self._archives_streaming = True
+        
+        task = SimpleBackupTask("list_archives")
+        task.signals.batch.connect(self.on_archives_batch)
+        task.signals.finished.connect(self.on_archives_loaded)
+        self.start_task(task)
+    
+    def start_task(self, task):
+        """Run a task on the pool, keeping it referenced until it finishes"""
+        self._tasks.add(task)
+        task.signals.finished.connect(lambda *args: self._tasks.discard(task))
+        self.pool.start(task)
+    
+    def on_archives_batch(self, archives):
+        """Insert streamed archives, most recent first"""
+        if not self._archives_streaming:
+            return
+        
+        # borg lists oldest first, so each batch goes above the previous ones
+        archives = archives[::-1]
+        self.archives[0:0] = archives
+        for position, archive in enumerate(archives, 1):
+            self.archive_combo.insertItem(position, f"{archive['date']} - {archive['name']}", archive)
+        self.status_label.setText(f"Loading... {len(self.archives)} backup archives")
     
     def on_archives_loaded(self, operation, result):
         """Handle loaded archives"""
+        self._archives_streaming = False
         if isinstance(result, str) and result.startswith("Error"):
             QMessageBox.critical(self, "Error", result)
             self.status_label.setText("Failed to load archives")
             return
         
-        self.archive_combo.clear()
-        self.archive_combo.addItem("Select backup date...", None)
-        
-        for archive in result:
-            display_text = f"{archive['date']} - {archive['name']}"
-            self.archive_combo.addItem(display_text, archive)
+        # Repopulate unless the revalidated or streamed list is already shown
+        if result != self.archives:
+            self.archives = result
+            
+            # Fill silently, then update the selection state once
+            self.archive_combo.blockSignals(True)
+            self.archive_combo.clear()
+            self.archive_combo.addItem("Select backup date...", None)
+            
+            for archive in result:
+                display_text = f"{archive['date']} - {archive['name']}"
+                self.archive_combo.addItem(display_text, archive)
+            self.archive_combo.blockSignals(False)
+            self.on_archive_selected()
         
         self.status_label.setText(f"Loaded {len(result)} backup archives")
     
@@ -304,24 +663,30 @@ class SimplePikaExplorer(QMainWindow):
         
         try:
             # Unmount existing
-            if os.path.ismount(self.mount_point):
-                subprocess.run(['borg', 'umount', self.mount_point], check=False)
+            self.stop_index()
+            if self._mounted and not self.umount_mount_point():
+                self.status_label.setText("Mount failed")
+                return
             
             os.makedirs(self.mount_point, exist_ok=True)
             
             # Mount archive
-            full_archive = f"/media/herb/Linux_Drive_2/PikaBackups/From_2502-07-11::{archive_name}"
+            full_archive = f"{REPO_PATH}::{archive_name}"
             result = subprocess.run(
-                ['bash', '-c', f'echo "y" | borg mount "{full_archive}" "{self.mount_point}"'],
-                capture_output=True, text=True, check=False, timeout=60
+                ['borg', 'mount', full_archive, self.mount_point],
+                capture_output=True, text=True, check=False, timeout=60, env=BORG_ENV
             )
             
             if result.returncode == 0:
+                self._mounted = True
                 self.current_archive = archive_name
                 self.current_path = os.path.join(self.mount_point, "home/herb")
                 self.unmount_btn.setEnabled(True)
                 self.mount_btn.setEnabled(False)
                 
+                # Pre-list the archive in the background
+                self.start_index(archive_name)
+                
                 # Setup folder list
                 self.setup_folder_list()
                 
@@ -337,6 +702,35 @@ class SimplePikaExplorer(QMainWindow):
             QMessageBox.critical(self, "Error", f"Mount error: {e}")
             self.status_label.setText("Mount failed")
     
+    def start_index(self, archive_name):
+        """Index the mounted archive so later navigation is served from memory"""
+        self.stop_index()
+        
+        task = BuildIndexTask(os.path.join(self.mount_point, "home/herb"))
+        task.signals.indexed.connect(
+            lambda path, mtime, rows: self.on_dir_indexed(archive_name, path, mtime, rows)
+        )
+        self.index_task = task
+        self.start_task(task)
+    
+    def stop_index(self):
+        """Cancel a running archive index and wait until it has left the mount"""
+        task = self.index_task
+        if task:
+            self.index_task = None
+            task.cancel.set()
+            if self.pool.tryTake(task):
+                # Never started, so it will not emit finished
+                self._tasks.discard(task)
+            else:
+                # An open scandir on the mount would make the umount fail with EBUSY
+                task.done.wait()
+    
+    def on_dir_indexed(self, archive_name, path, mtime, rows):
+        """Store an indexed directory unless a listing is already cached"""
+        if archive_name == self.current_archive:
+            self._dir_cache.setdefault((archive_name, path), (mtime, rows))
+    
     def setup_folder_list(self):
         """Setup quick access folder list"""
         self.folder_list.clear()
@@ -344,20 +738,27 @@ class SimplePikaExplorer(QMainWindow):
         base_path = os.path.join(self.mount_point, "home/herb")
         folders = [".", "Desktop", "Documents", "Projects", "Downloads", "Pictures", "Scripts"]
         
+        # One directory read instead of a stat per folder
+        try:
+            with os.scandir(base_path) as it:
+                present = {entry.name for entry in it if entry.is_dir(follow_symlinks=False)}
+        except OSError:
+            present = set()
+        
         for folder in folders:
             if folder == ".":
                 folder_path = base_path
                 display_name = "🏠 Home"
             else:
+                if folder not in present:
+                    continue
+                
                 folder_path = os.path.join(base_path, folder)
                 display_name = f"📁 {folder}"
-                
-                if not os.path.exists(folder_path):
-                    continue
             
-            item = self.folder_list.addItem(display_name)
-            item = self.folder_list.item(self.folder_list.count() - 1)
+            item = QListWidgetItem(display_name)
             item.setData(Qt.UserRole, folder_path)
+            self.folder_list.addItem(item)
     
     def on_folder_selected(self, item):
         """Handle folder selection"""
@@ -377,44 +778,72 @@ class SimplePikaExplorer(QMainWindow):
         self.path_label.setText(f"📁 {relative_path}")
         self.status_label.setText(f"Loading files from {relative_path}...")
         
-        self.worker = SimpleBackupWorker("list_files", path)
-        self.worker.finished.connect(self.on_files_loaded)
-        self.worker.start()
+        self.file_model.clear()
+        
+        # Any listing still running is now stale
+        self._current_token += 1
+        token = self._current_token
+        if self.files_task:
+            self.files_task.cancel.set()
+            self.files_task = None
+        
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        
+        # Revisited directory: serve the cached listing
+        cache_key = (self.current_archive, path)
+        cached = self._dir_cache.get(cache_key)
+        if mtime is not None and cached and cached[0] == mtime:
+            self.add_file_rows(cached[1])
+            self.on_files_loaded("list_files", cached[1])
+            return
+        
+        task = SimpleBackupTask("list_files", path)
+        self.files_task = task
+        task.signals.batch.connect(lambda files: self.on_files_batch(token, files))
+        task.signals.finished.connect(
+            lambda operation, result: self.cache_files(cache_key, mtime, result)
+        )
+        task.signals.finished.connect(
+            lambda operation, result: self.on_files_loaded(operation, result, token)
+        )
+        self.start_task(task)
+    
+    def cache_files(self, cache_key, mtime, result):
+        """Remember a directory listing for later visits"""
+        if mtime is not None and isinstance(result, list):
+            self._dir_cache[cache_key] = (mtime, result)
+    
+    def on_files_batch(self, token, files):
+        """Append a batch of streamed files to the table"""
+        # Ignore rows from a listing that was superseded
+        if token != self._current_token:
+            return
+        
+        self.add_file_rows(files)
+    
+    def add_file_rows(self, files):
+        """Append files to the table"""
+        self.file_model.append_files(files)
+        self.status_label.setText(f"Loading... {self.file_model.rowCount()} items")
     
-    def on_files_loaded(self, operation, result):
+    def on_files_loaded(self, operation, result, token=None):
         """Handle loaded files"""
+        if token is not None and token != self._current_token:
+            return
+        
         if isinstance(result, str):
             QMessageBox.warning(self, "Warning", result)
             return
         
-        # Clear and populate table
-        self.file_table.setRowCount(0)
-        
-        for file_info in result:
-            row = self.file_table.rowCount()
-            self.file_table.insertRow(row)
-            
-            # Name with icon
-            icon = "📁" if file_info['is_dir'] else "📄"
-            name_item = QTableWidgetItem(f"{icon} {file_info['name']}")
-            name_item.setData(Qt.UserRole, file_info)
-            self.file_table.setItem(row, 0, name_item)
-            
-            # Date
-            self.file_table.setItem(row, 1, QTableWidgetItem(file_info['date']))
-            
-            # Size
-            self.file_table.setItem(row, 2, QTableWidgetItem(file_info['size']))
-        
         self.file_table.resizeColumnsToContents()
         self.status_label.setText(f"Loaded {len(result)} items")
     
-    def on_file_double_clicked(self, item):
+    def on_file_double_clicked(self, index):
         """Handle file double-click"""
-        if item.column() != 0:
-            return
-        
-        file_info = item.data(Qt.UserRole)
+        file_info = index.data(Qt.UserRole)
         if file_info['is_dir']:
             # Navigate to directory
             self.current_path = file_info['path']
@@ -422,79 +851,82 @@ class SimplePikaExplorer(QMainWindow):
     
     def on_selection_changed(self):
         """Handle selection change"""
-        selected = self.file_table.selectedItems()
-        has_selection = len(selected) > 0
+        has_selection = self.file_table.selectionModel().hasSelection()
         
-        self.temp_copy_btn.setEnabled(has_selection)
-        self.copy_btn.setEnabled(has_selection)
+        self.temp_copy_btn.setEnabled(has_selection and not self.copy_running)
+        self.copy_btn.setEnabled(has_selection and not self.copy_running)
 
     def get_selected_items(self):
         """Get selected file info"""
-        selected_items = []
-        selected_rows = set()
-        for item in self.file_table.selectedItems():
-            selected_rows.add(item.row())
-
-        for row in sorted(list(selected_rows)):
-            item = self.file_table.item(row, 0)
-            if item:
-                selected_items.append(item.data(Qt.UserRole))
-        return selected_items
+        rows = sorted(index.row() for index in self.file_table.selectionModel().selectedRows())
+        return [self.file_model.files[row] for row in rows]
 
     def temp_copy_selected(self):
         """Copy selected items to temp"""
-        items = self.get_selected_items()
-        if items:
-            for item in items:
-                self.copy_item(item, self.temp_path, "Temp")
-            QMessageBox.information(self, "Success", f"Copied {len(items)} items to Temp folder.")
+        self.copy_selected_to(self.temp_path, "Temp")
 
     def copy_selected(self):
         """Copy selected items permanently"""
-        items = self.get_selected_items()
-        if items:
-            for item in items:
-                self.copy_item(item, self.recovery_path, "Recovery")
-            QMessageBox.information(self, "Success", f"Copied {len(items)} items to Recovery folder.")
-
-    def copy_item(self, item_info, dest_dir, dest_type):
-        """Copy file or directory to destination"""
-        try:
-            src_path = item_info['path']
-            item_name = item_info['name']
-            dest_path = os.path.join(dest_dir, item_name)
-            
-            # Handle duplicates
-            counter = 1
-            base_name, ext = os.path.splitext(item_name)
-            while os.path.exists(dest_path):
-                dest_path = os.path.join(dest_dir, f"{base_name}_{counter}{ext}")
-                counter += 1
-            
-            if item_info['is_dir']:
-                shutil.copytree(src_path, dest_path)
-            else:
-                shutil.copy2(src_path, dest_path)
+        self.copy_selected_to(self.recovery_path, "Recovery")
 
-            self.status_label.setText(f"Copied {item_name} to {dest_type}")
+    def copy_selected_to(self, dest_dir, dest_type):
+        """Copy selected items in the background"""
+        items = self.get_selected_items()
+        if not items:
+            return
         
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Copy failed for {item_name}: {e}")
+        self.copy_running = True
+        self.temp_copy_btn.setEnabled(False)
+        self.copy_btn.setEnabled(False)
+        
+        task = CopyTask(items, dest_dir)
+        task.signals.progress.connect(
+            lambda done, total: self.status_label.setText(f"Copying {done}/{total} to {dest_type}...")
+        )
+        task.signals.finished.connect(
+            lambda copied, errors: self.on_copy_finished(dest_type, copied, errors)
+        )
+        self.start_task(task)
+
+    def on_copy_finished(self, dest_type, copied, errors):
+        """Report a finished background copy"""
+        self.copy_running = False
+        self.on_selection_changed()
+        self.status_label.setText(f"Copied {copied} items to {dest_type}")
+        
+        if errors:
+            QMessageBox.critical(self, "Error", "Copy failed for:\n" + "\n".join(errors))
+        if copied:
+            QMessageBox.information(self, "Success", f"Copied {copied} items to {dest_type} folder.")
+    
+    def umount_mount_point(self):
+        """Unmount the mount point, returning False and keeping the mount state if borg fails"""
+        result = subprocess.run(
+            ['borg', 'umount', self.mount_point], capture_output=True, text=True, check=False
+        )
+        if result.returncode != 0:
+            QMessageBox.warning(self, "Warning", f"Unmount failed: {result.stderr}")
+            return False
+        self._mounted = False
+        return True
     
     def unmount_archive(self):
         """Unmount current archive"""
         try:
-            if os.path.ismount(self.mount_point):
-                subprocess.run(['borg', 'umount', self.mount_point], check=False)
+            self.stop_index()
+            if self._mounted and not self.umount_mount_point():
+                self.status_label.setText("Unmount failed")
+                return
             
             self.current_archive = None
             self.current_path = None
             self.unmount_btn.setEnabled(False)
+            self._dir_cache.clear()
             self.mount_btn.setEnabled(True)
             
             # Clear interface
             self.folder_list.clear()
-            self.file_table.setRowCount(0)
+            self.file_model.clear()
             self.path_label.setText("No archive mounted")
             
             self.status_label.setText("Archive unmounted")
@@ -505,7 +937,8 @@ class SimplePikaExplorer(QMainWindow):
     def closeEvent(self, event):
         """Handle close event"""
         try:
-            if os.path.ismount(self.mount_point):
+            self.stop_index()
+            if self._mounted:
                 subprocess.run(['borg', 'umount', self.mount_point], check=False)
         except:
             pass
@@ -2,14 +2,239 @@
 
 import sys
 import os
-import subprocess
-import re # Import regex module
+import json
+import functools
+import pwd
+import grp
+import stat
+import hashlib
+import pickle
+import tempfile
+from datetime import datetime
+from operator import itemgetter
+from collections import deque
 
 from PySide6.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
-    QListWidget, QTreeWidget, QTreeWidgetItem, QFileDialog, QLabel, QMessageBox, QStyle
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTreeWidgetItemIterator,
+    QListWidget, QListWidgetItem, QTreeWidget, QTreeWidgetItem, QFileDialog, QLabel, QMessageBox, QStyle, QCheckBox
 )
-from PySide6.QtCore import Qt, QProcess, QDateTime
+from PySide6.QtCore import (
+    Qt, QProcess, QProcessEnvironment, QDateTime, QTimer, QObject, QRunnable, QThreadPool, Signal
+)
+
+# orjson parses large borg list output faster when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+@functools.lru_cache(maxsize=4096)
+def _uid_name(uid):
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+@functools.lru_cache(maxsize=4096)
+def _gid_name(gid):
+    try:
+        return grp.getgrgid(gid).gr_name
+    except KeyError:
+        return str(gid)
+
+# Archive lists and fast browse listings kept between runs
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "PikaPeek")
+ARCHIVES_CACHE_FILE = os.path.join(CACHE_DIR, "archives.json")
+# Listings kept on disk; the least recently used beyond this are deleted
+LISTING_CACHE_MAX = 32
+
+def _listing_cache_path(archive_path, archive_id):
+    # Archives never change once written, so repository and id identify a listing
+    key = hashlib.sha1(f"{archive_path}::{archive_id}".encode()).hexdigest()
+    return os.path.join(CACHE_DIR, "listings", f"{key}.pickle")
+
+def _prune_listing_cache():
+    listings_dir = os.path.join(CACHE_DIR, "listings")
+    try:
+        with os.scandir(listings_dir) as it:
+            listings = [(entry.stat().st_mtime, entry.path) for entry in it if entry.name.endswith(".pickle")]
+    except OSError:
+        return
+    listings.sort(reverse=True)
+    for _, path in listings[LISTING_CACHE_MAX:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _load_archive_cache(archive_path):
+    try:
+        with open(ARCHIVES_CACHE_FILE, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cache.get("archives") if cache.get("archive_path") == archive_path else None
+
+def _save_archive_cache(archive_path, archives):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(ARCHIVES_CACHE_FILE + ".tmp", "w") as f:
+            json.dump({"archive_path": archive_path, "archives": archives}, f)
+        os.replace(ARCHIVES_CACHE_FILE + ".tmp", ARCHIVES_CACHE_FILE)
+    except OSError as e:
+        print(f"Could not write archive cache: {e}")
+
+# Scanned rows turned into tree items per flush, and the delay that coalesces flushes
+CHILD_BATCH_SIZE = 2000
+CHILD_FLUSH_INTERVAL_MS = 50
+
+# Permissions, User and Group columns; hidden unless details are shown
+DETAIL_COLUMNS = (2, 3, 4)
+# Item role holding (mode, uid, gid) for files whose detail columns are not filled in yet
+DETAILS_ROLE = Qt.UserRole + 1
+
+# File type and permission bits for the characters of an ls-style mode string
+_MODE_STRING_TYPES = {"-": stat.S_IFREG, "d": stat.S_IFDIR, "l": stat.S_IFLNK}
+_MODE_STRING_BITS = (0o400, 0o200, 0o100, 0o40, 0o20, 0o10, 0o4, 0o2, 0o1)
+
+def _mode_from_string(mode_string):
+    # "drwxr-sr-x" -> 0o42755, as os.stat would report it
+    mode = _MODE_STRING_TYPES.get(mode_string[:1], 0)
+    for char, bit in zip(mode_string[1:10], _MODE_STRING_BITS):
+        if char in "rwxst":
+            mode |= bit
+    if mode_string[3:4] in ("s", "S"):
+        mode |= 0o4000
+    if mode_string[6:7] in ("s", "S"):
+        mode |= 0o2000
+    if mode_string[9:10] in ("t", "T"):
+        mode |= 0o1000
+    return mode
+
+def _row_sort_key(row):
+    # Directories first, then by name
+    return (not row[6], row[0])
+
+def _index_listing(stdout):
+    # Group `borg list --json-lines` entries by parent directory as tree rows
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+    listing = {}
+    for line in stdout.splitlines():
+        if not line:
+            continue
+        entry = loads(line)
+        path = entry["path"]
+        parent, _, name = path.rpartition("/")
+        if entry["type"] == "d":
+            row = (name, None, None, None, None, None, True, path)
+        else:
+            mtime = datetime.fromisoformat(entry["mtime"]).timestamp()
+            row = (name, entry["size"], _mode_from_string(entry["mode"]), entry["uid"], entry["gid"], mtime, False, path)
+        listing.setdefault(parent, []).append(row)
+
+    # Archives created from nested paths do not store their ancestor directories
+    known_dirs = {row[7] for rows in listing.values() for row in rows if row[6]}
+    for parent in list(listing):
+        while parent and parent not in known_dirs:
+            known_dirs.add(parent)
+            grandparent, _, name = parent.rpartition("/")
+            listing.setdefault(grandparent, []).append((name, None, None, None, None, None, True, parent))
+            parent = grandparent
+    return listing
+
+@functools.lru_cache(maxsize=1024)
+def _iso_mtime(seconds):
+    # Files restored or written together share modification seconds
+    return QDateTime.fromSecsSinceEpoch(seconds).toString(Qt.ISODate)
+
+@functools.lru_cache(maxsize=512)
+def _permissions(permission_bits):
+    return f"{permission_bits:04o}"
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class _ScanDirSignals(QObject):
+    scanned = Signal(list)
+
+class _ScanDirJob(QRunnable):
+    # Reads one directory level on a pool thread; rows are
+    # (name, size, mode, uid, gid, mtime, is_dir, full_path), metadata None for directories
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.signals = _ScanDirSignals()
+
+    def run(self):
+        rows = []
+        try:
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    size = mode = uid = gid = mtime = None
+                    if not is_dir:
+                        try:
+                            stat_info = entry.stat(follow_symlinks=False)
+                            size, mode = stat_info.st_size, stat_info.st_mode
+                            uid, gid, mtime = stat_info.st_uid, stat_info.st_gid, stat_info.st_mtime
+                        except OSError as e:
+                            print(f"Could not get file info for {entry.path}: {e}")
+                    rows.append((entry.name, size, mode, uid, gid, mtime, is_dir, entry.path))
+        except OSError as e:
+            print(f"Could not list {self.path}: {e}")
+
+        rows.sort(key=_row_sort_key)
+        self.signals.scanned.emit(rows)
+
+class _ListingSignals(QObject):
+    indexed = Signal(object)
+
+class _IndexListingJob(QRunnable):
+    # Parses a whole archive listing on a pool thread and stores it at cache_path;
+    # without stdout the listing is read back from cache_path (None if unreadable)
+    def __init__(self, stdout, cache_path):
+        super().__init__()
+        self.stdout = stdout
+        self.cache_path = cache_path
+        self.signals = _ListingSignals()
+
+    def run(self):
+        if self.stdout is None:
+            try:
+                with open(self.cache_path, "rb") as f:
+                    listing = pickle.load(f)
+                # Reads count as use, so pruning drops the listings not opened for longest
+                os.utime(self.cache_path)
+            except Exception as e:
+                # A stale or foreign pickle can fail in many ways; any of them means "ask borg"
+                print(f"Could not read cached listing {self.cache_path}: {e}")
+                listing = None
+            self.signals.indexed.emit(listing)
+            return
+
+        try:
+            listing = _index_listing(self.stdout)
+        except (ValueError, KeyError) as e:
+            print(f"Could not parse archive listing: {e}")
+            self.signals.indexed.emit({})
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path + ".tmp", "wb") as f:
+                pickle.dump(listing, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(self.cache_path + ".tmp", self.cache_path)
+        except OSError as e:
+            print(f"Could not write cached listing {self.cache_path}: {e}")
+        _prune_listing_cache()
+        self.signals.indexed.emit(listing)
 
 class PikaBackupApp(QWidget):
     def __init__(self):
@@ -19,30 +244,54 @@ class PikaBackupApp(QWidget):
 
         self.archive_path = "/media/herb/Linux_Drive_2/Pika Backups/backup-herb-Ubuntu-24.10-2TB-herb-2024-12-23"
         self.mounted_backup_path = None
+        self._is_mounted = False # Set once a mount is verified, cleared when it is released
+        self._unmount_process = None # The borg umount in flight, if any
+        self._unmount_on_done = None # Callback of the latest caller waiting on that unmount
         self.current_backup_id = None
         self.borg_passphrase = None # Store passphrase from .env
+        self._scan_jobs = set() # Directory scans in flight, kept alive until they report
+        self._tree_generation = 0 # Bumped whenever the tree is cleared so stale scans are dropped
+        self._listing = None # Fast browse: archive rows keyed by parent directory, instead of a mount
+        self._pending_children = deque() # (parent_item, generation, rows, next_row) awaiting tree items
 
         self.load_passphrase_from_env() # Load passphrase at startup
         self.init_ui()
 
+        # Scan results are added to the tree in slices on this timer
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(CHILD_FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush_pending_children)
+
+        # One mount point per run, reused for every archive selected
+        self.mount_root = os.path.join(tempfile.gettempdir(), f"pika_mount_{os.getpid()}")
+        self._cleanup_stale_mounts()
+        os.makedirs(self.mount_root, exist_ok=True)
+
     def load_passphrase_from_env(self):
         env_file_path = os.path.join(os.path.dirname(__file__), '.env')
         if os.path.exists(env_file_path):
             with open(env_file_path, 'r') as f:
                 for line in f:
-                    match = re.match(r'passkey:\s*"([^"]+)"', line.strip())
-                    if match:
-                        self.borg_passphrase = match.group(1)
+                    key, sep, value = line.strip().partition(":")
+                    value = value.strip().strip('"')
+                    if sep and key == "passkey" and value:
+                        self.borg_passphrase = value
                         print(f"Passphrase loaded from .env: {self.borg_passphrase}")
                         break
             if not self.borg_passphrase:
                 QMessageBox.warning(self, ".env Error", "Passkey not found in .env file or format is incorrect.")
         else:
-            QMessageBox.warning(self, ".env Missing", "No .env file found. Please create one with 'passkey: "<your_passphrase>"'.")
+            QMessageBox.warning(self, ".env Missing", "No .env file found. Please create one with 'passkey: \"<your_passphrase>\"'.")
 
     def init_ui(self):
         main_layout = QVBoxLayout()
 
+        # Icons shared by every tree item
+        style = QApplication.style()
+        self._dir_icon = style.standardIcon(QStyle.SP_DirIcon)
+        self._file_icon = style.standardIcon(QStyle.SP_FileIcon)
+
         # Archive Path Selection
         archive_layout = QHBoxLayout()
         self.archive_label = QLabel("Pika Archive Path:")
@@ -55,6 +304,9 @@ class PikaBackupApp(QWidget):
         self.load_archive_button = QPushButton("Load Archive")
         self.load_archive_button.clicked.connect(self.load_archive)
         archive_layout.addWidget(self.load_archive_button)
+        self.fast_browse_checkbox = QCheckBox("Fast browse (no FUSE)")
+        self.fast_browse_checkbox.setToolTip("List archive contents with borg list instead of mounting the archive")
+        archive_layout.addWidget(self.fast_browse_checkbox)
         main_layout.addLayout(archive_layout)
 
         # Backup List and File Viewer
@@ -71,10 +323,20 @@ class PikaBackupApp(QWidget):
 
         # File Viewer
         file_viewer_layout = QVBoxLayout()
+        file_viewer_header_layout = QHBoxLayout()
         file_viewer_label = QLabel("Backup Contents:")
-        file_viewer_layout.addWidget(file_viewer_label)
+        file_viewer_header_layout.addWidget(file_viewer_label)
+        file_viewer_header_layout.addStretch()
+        self.show_details_checkbox = QCheckBox("Show details")
+        self.show_details_checkbox.toggled.connect(self._on_show_details_toggled)
+        file_viewer_header_layout.addWidget(self.show_details_checkbox)
+        file_viewer_layout.addLayout(file_viewer_header_layout)
         self.file_tree_widget = QTreeWidget()
         self.file_tree_widget.setHeaderLabels(["Name", "Size", "Permissions", "User", "Group", "Date Modified"])
+        for column in DETAIL_COLUMNS:
+            self.file_tree_widget.setColumnHidden(column, True)
+        self.file_tree_widget.setUniformRowHeights(True)
+        self.file_tree_widget.itemExpanded.connect(self._on_item_expanded)
         file_viewer_layout.addWidget(self.file_tree_widget)
         content_layout.addLayout(file_viewer_layout, 3)
 
@@ -111,54 +373,108 @@ class PikaBackupApp(QWidget):
             return
 
         self.backup_list_widget.clear()
-        self.file_tree_widget.clear()
+        self._clear_file_tree()
         self.restore_original_button.setEnabled(False)
         self.restore_to_button.setEnabled(False)
         self.current_backup_id = None
-        self.unmount_current_backup()
+        self._unmount_async()
+
+        # Show the archives from the last load while borg lists the current ones
+        cached_archives = _load_archive_cache(self.archive_path)
+        if cached_archives:
+            self._show_archives(cached_archives)
 
         self.run_borg_command(["list", "--json", self.archive_path], self.parse_backup_list, self.borg_passphrase)
 
     def parse_backup_list(self, stdout):
         try:
-            import json
-            data = json.loads(stdout)
-            print(f"Parsed borg list JSON: {json.dumps(data, indent=2)}") # Debug print
+            data = orjson.loads(stdout) if ORJSON_AVAILABLE else json.loads(stdout)
+            if os.environ.get("PIKA_DEBUG"):
+                print(f"Parsed borg list JSON: {json.dumps(data, indent=2)}") # Debug print
             archives = data.get("archives", [])
-            # Sort archives by timestamp in descending order (most recent first)
-            archives.sort(key=lambda x: x.get("time", ""), reverse=True)
             for archive in archives:
-                name = archive.get("name")
-                id = archive.get("id")
-                timestamp = archive.get("time")
-                print(f"Adding backup to list: Name={name}, ID={id}, Timestamp={timestamp}") # Debug print
-                self.backup_list_widget.addItem(f"{name} ({timestamp}) - ID: {id}")
+                archive.setdefault("time", "")
+            # Sort archives by timestamp in descending order (most recent first)
+            archives.sort(key=itemgetter("time"), reverse=True)
+            archives = [{"name": a.get("name"), "id": a.get("id"), "time": a.get("time")} for a in archives]
+            self._show_archives(archives)
+            _save_archive_cache(self.archive_path, archives)
         except json.JSONDecodeError:
             QMessageBox.critical(self, "Error", "Failed to parse borg list output. Is the repository valid and passphrase correct?")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An error occurred: {e}")
 
+    def _show_archives(self, archives):
+        self.backup_list_widget.clear()
+        self.backup_list_widget.setUpdatesEnabled(False)
+        for archive in archives:
+            name = archive.get("name")
+            id = archive.get("id")
+            timestamp = archive.get("time")
+            print(f"Adding backup to list: Name={name}, ID={id}, Timestamp={timestamp}") # Debug print
+            item = QListWidgetItem(f"{name} ({timestamp})")
+            item.setData(Qt.UserRole, id)
+            self.backup_list_widget.addItem(item)
+        self.backup_list_widget.setUpdatesEnabled(True)
+
     def select_backup(self, item):
-        self.unmount_current_backup()
-        self.file_tree_widget.clear()
+        self._clear_file_tree()
         self.restore_original_button.setEnabled(False)
         self.restore_to_button.setEnabled(False)
 
-        text = item.text()
-        # Extract ID from the item text
-        try:
-            self.current_backup_id = text.split("ID: ")[1]
-            print(f"Selected backup ID for mounting: {self.current_backup_id}") # Debug print
-        except IndexError:
-            QMessageBox.warning(self, "Error", "Could not extract backup ID from selected item.")
-            return
+        self.current_backup_id = item.data(Qt.UserRole)
+        print(f"Selected backup ID for mounting: {self.current_backup_id}") # Debug print
 
         if not self.borg_passphrase:
             QMessageBox.critical(self, "Passphrase Error", "Borg passphrase not loaded. Cannot mount archive.")
             return
 
-        self.mounted_backup_path = os.path.join("/tmp", f"pika_mount_{os.getpid()}")
-        os.makedirs(self.mounted_backup_path, exist_ok=True)
+        # Browse or mount once the previously selected backup has been released
+        if self.fast_browse_checkbox.isChecked():
+            self._unmount_async(self._list_current_backup)
+        else:
+            self._unmount_async(self._mount_current_backup)
+
+    def _list_current_backup(self):
+        # A listing saved by an earlier fast browse of this archive skips borg entirely
+        if os.path.exists(_listing_cache_path(self.archive_path, self.current_backup_id)):
+            self._index_listing_async(None)
+            return
+
+        self.run_borg_command(
+            ["list", "--json-lines", f"{self.archive_path}::{self.current_backup_id}"],
+            self.on_listing_complete, self.borg_passphrase
+        )
+
+    def on_listing_complete(self, stdout):
+        self._index_listing_async(stdout)
+
+    def _index_listing_async(self, stdout):
+        job = _IndexListingJob(stdout, _listing_cache_path(self.archive_path, self.current_backup_id))
+        generation = self._tree_generation
+        self._scan_jobs.add(job)
+        job.signals.indexed.connect(lambda listing: self._on_listing_indexed(job, generation, listing))
+        QThreadPool.globalInstance().start(job)
+
+    def _on_listing_indexed(self, job, generation, listing):
+        self._scan_jobs.discard(job)
+        if generation != self._tree_generation:
+            return # Another backup was selected while the listing was parsed
+        if listing is None:
+            # Unreadable cached listing: drop it and ask borg again
+            try:
+                os.remove(job.cache_path)
+            except OSError:
+                pass
+            self._list_current_backup()
+            return
+        self._listing = listing
+        self._populate_children(self.file_tree_widget.invisibleRootItem(), "")
+        self.restore_original_button.setEnabled(True)
+        self.restore_to_button.setEnabled(True)
+
+    def _mount_current_backup(self):
+        self.mounted_backup_path = self.mount_root
 
         self.run_borg_command(
             ["mount", f"{self.archive_path}::{self.current_backup_id}", self.mounted_backup_path],
@@ -166,8 +482,9 @@ class PikaBackupApp(QWidget):
         )
 
     def on_mount_complete(self, stdout):
-        if self.mounted_backup_path and os.path.ismount(self.mounted_backup_path):
-            self.populate_file_tree(self.mounted_backup_path, self.file_tree_widget.invisibleRootItem())
+        self._is_mounted = bool(self.mounted_backup_path and os.path.ismount(self.mounted_backup_path))
+        if self._is_mounted:
+            self._populate_children(self.file_tree_widget.invisibleRootItem(), self.mounted_backup_path)
             self.restore_original_button.setEnabled(True)
             self.restore_to_button.setEnabled(True)
         else:
@@ -176,29 +493,115 @@ class PikaBackupApp(QWidget):
                                  "FUSE not working, or other issues. Please verify your passphrase and try again. "
                                  f"You can also try running the command manually in a terminal: "
                                  f"BORG_PASSPHRASE='{self.borg_passphrase}' borg mount {self.archive_path}::{self.current_backup_id} {self.mounted_backup_path}")
-            self.unmount_current_backup()
+            self._unmount_async()
+
+    def _clear_file_tree(self):
+        self._tree_generation += 1
+        self._listing = None
+        self.file_tree_widget.clear()
+
+    def _populate_children(self, parent_item, path):
+        if self._listing is not None:
+            # Fast browse: the rows are already in memory
+            rows = self._listing.get(path, [])
+            rows.sort(key=_row_sort_key)
+            self._add_scanned_children(None, self._tree_generation, parent_item, rows)
+            return
 
-    def populate_file_tree(self, path, parent_item):
-        for entry in os.listdir(path):
-            full_path = os.path.join(path, entry)
-            item = QTreeWidgetItem([entry])
-            parent_item.addChild(item)
+        # Only one directory level is read, off the GUI thread; subdirectories are filled when expanded
+        job = _ScanDirJob(path)
+        generation = self._tree_generation
+        self._scan_jobs.add(job)
+        job.signals.scanned.connect(lambda rows: self._add_scanned_children(job, generation, parent_item, rows))
+        QThreadPool.globalInstance().start(job)
+
+    def _add_scanned_children(self, job, generation, parent_item, rows):
+        self._scan_jobs.discard(job)
+        if generation != self._tree_generation:
+            return # The tree was cleared while the directory was being read
+
+        self._pending_children.append((parent_item, generation, rows, 0))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_pending_children(self):
+        # Build at most CHILD_BATCH_SIZE items per tick so huge directories don't stall the GUI
+        budget = CHILD_BATCH_SIZE
+        self.file_tree_widget.setUpdatesEnabled(False)
+        while self._pending_children and budget > 0:
+            parent_item, generation, rows, start = self._pending_children[0]
+            if generation != self._tree_generation:
+                self._pending_children.popleft()
+                continue
+
+            # Drop the loading placeholder
+            if start == 0 and parent_item.childCount() == 1 and parent_item.child(0).data(0, Qt.UserRole) is None:
+                parent_item.takeChild(0)
+
+            end = min(start + budget, len(rows))
+            parent_item.addChildren(self._build_tree_items(rows[start:end]))
+            budget -= end - start
+            if end == len(rows):
+                self._pending_children.popleft()
+            else:
+                self._pending_children[0] = (parent_item, generation, rows, end)
+        self.file_tree_widget.setUpdatesEnabled(True)
+
+        if self._pending_children:
+            self._flush_timer.start()
+
+    def _build_tree_items(self, rows):
+        show_details = self.show_details_checkbox.isChecked()
+        items = []
+        for name, size, mode, uid, gid, mtime, is_dir, full_path in rows:
+            item = QTreeWidgetItem([name])
+            item.setData(0, Qt.UserRole, full_path)
+            items.append(item)
             
-            if os.path.isdir(full_path):
-                item.setIcon(0, QApplication.style().standardIcon(QStyle.SP_DirIcon))
-                self.populate_file_tree(full_path, item)
+            if is_dir:
+                item.setIcon(0, self._dir_icon)
+                item.addChild(QTreeWidgetItem(["…"])) # Placeholder so the item shows an expander
             else:
-                item.setIcon(0, QApplication.style().standardIcon(QStyle.SP_FileIcon))
-                try:
-                    stat_info = os.stat(full_path)
-                    item.setText(1, str(stat_info.st_size))
-                    item.setText(2, oct(stat_info.st_mode)[-4:])
-                    import pwd, grp
-                    item.setText(3, pwd.getpwuid(stat_info.st_uid).pw_name)
-                    item.setText(4, grp.getgrgid(stat_info.st_gid).gr_name)
-                    item.setText(5, QDateTime.fromSecsSinceEpoch(stat_info.st_mtime).toString(Qt.ISODate))
-                except Exception as e:
-                    print(f"Could not get file info for {full_path}: {e}")
+                item.setIcon(0, self._file_icon)
+                if size is None:
+                    continue
+                # Owner and permission columns are only formatted while they are visible
+                if show_details:
+                    self._set_detail_texts(item, mode, uid, gid)
+                else:
+                    item.setData(0, DETAILS_ROLE, (mode, uid, gid))
+                item.setText(1, str(size))
+                item.setText(5, _iso_mtime(int(mtime)))
+        return items
+
+    def _set_detail_texts(self, item, mode, uid, gid):
+        item.setText(2, _permissions(mode & 0o7777))
+        item.setText(3, _uid_name(uid))
+        item.setText(4, _gid_name(gid))
+
+    def _on_show_details_toggled(self, checked):
+        for column in DETAIL_COLUMNS:
+            self.file_tree_widget.setColumnHidden(column, not checked)
+        if not checked:
+            return
+
+        # Fill in the rows that were built while the columns were hidden
+        iterator = QTreeWidgetItemIterator(self.file_tree_widget)
+        while iterator.value():
+            item = iterator.value()
+            details = item.data(0, DETAILS_ROLE)
+            if details is not None:
+                self._set_detail_texts(item, *details)
+                item.setData(0, DETAILS_ROLE, None)
+            iterator += 1
+
+    def _on_item_expanded(self, item):
+        # A single child without a path is the placeholder added for unread directories
+        if item.childCount() == 1 and item.child(0).data(0, Qt.UserRole) is None:
+            placeholder = item.child(0)
+            if placeholder.text(0) != "Loading…":
+                placeholder.setText(0, "Loading…")
+                self._populate_children(item, item.data(0, Qt.UserRole))
 
     def restore_to_original(self):
         selected_items = self.file_tree_widget.selectedItems()
@@ -216,7 +619,7 @@ class PikaBackupApp(QWidget):
         for item in selected_items:
             # Reconstruct the original path from the mounted path
             relative_path = self.get_path_from_tree_item(item)
-            if relative_path.startswith(self.mounted_backup_path):
+            if self.mounted_backup_path and relative_path.startswith(self.mounted_backup_path):
                 original_target_path = relative_path[len(self.mounted_backup_path):].lstrip(os.sep)
             else:
                 original_target_path = relative_path # Should not happen if logic is correct
@@ -245,29 +648,21 @@ class PikaBackupApp(QWidget):
                                     f"Simulating restore of {relative_path} to {dest_dir}. Actual command would be: borg extract {self.archive_path}::{self.current_backup_id} --paths {relative_path} {dest_dir}")
 
     def get_path_from_tree_item(self, item):
-        path_parts = []
-        current_item = item
-        while current_item:
-            path_parts.insert(0, current_item.text(0))
-            current_item = current_item.parent()
-        
-        # The first part will be the mount point, which we need to remove for relative path within backup
-        # Or, if we are populating from the mounted path, the first part is the mount point itself.
-        # We need the path relative to the mounted_backup_path
-        full_path_in_mount = os.path.join(self.mounted_backup_path, *path_parts[1:]) # Skip the root item which is the mount point
-        return full_path_in_mount
+        # Stored on the item by _add_scanned_children: absolute inside the mount, archive-relative in fast browse
+        return item.data(0, Qt.UserRole)
 
     def run_borg_command(self, command_args, callback=None, passphrase=None):
         full_command = ["borg"] + command_args
         print(f"Running command: {' '.join(full_command)}")
         
         process = QProcess(self)
-        process.readyReadStandardOutput.connect(lambda: self.handle_stdout(process))
-        process.readyReadStandardError.connect(lambda: self.handle_stderr(process))
-        process.finished.connect(lambda: self.on_command_finished(process, callback))
+        process.readyReadStandardOutput.connect(functools.partial(self.handle_stdout, process))
+        process.readyReadStandardError.connect(functools.partial(self.handle_stderr, process))
+        process.finished.connect(functools.partial(self.on_command_finished, process, callback))
         
-        process.stdout_buffer = ""
-        process.stderr_buffer = ""
+        # Raw bytes are accumulated and decoded once the command has finished
+        process.stdout_buffer = bytearray()
+        process.stderr_buffer = bytearray()
 
         # Set environment variables for the process
         environment = process.processEnvironment()
@@ -280,47 +675,125 @@ class PikaBackupApp(QWidget):
             QMessageBox.critical(self, "Process Error", f"Failed to start borg process: {process.errorString()}")
 
     def handle_stdout(self, process):
-        process.stdout_buffer += process.readAllStandardOutput().data().decode()
+        process.stdout_buffer += process.readAllStandardOutput().data()
 
     def handle_stderr(self, process):
-        process.stderr_buffer += process.readAllStandardError().data().decode()
+        process.stderr_buffer += process.readAllStandardError().data()
 
-    def on_command_finished(self, process, callback):
+    def on_command_finished(self, process, callback, exit_code=0, exit_status=None):
         command_str = ' '.join(process.arguments()) # Get the command that was run
         print(f"Command finished: {command_str}")
-        if process.exitCode() != 0:
-            QMessageBox.critical(self, "Borg Command Error", f"Command '{command_str}' failed with exit code {process.exitCode()}:\n{process.stderr_buffer}")
+        if exit_code != 0:
+            QMessageBox.critical(self, "Borg Command Error", f"Command '{command_str}' failed with exit code {exit_code}:\n{process.stderr_buffer.decode('utf-8', 'replace')}")
         elif callback:
-            callback(process.stdout_buffer)
+            callback(process.stdout_buffer.decode('utf-8', 'replace'))
+
+        process.readyReadStandardOutput.disconnect()
+        process.readyReadStandardError.disconnect()
+        process.finished.disconnect()
+        process.deleteLater()
+
+    def _unmount_async(self, on_done=None):
+        # borg umount waits for FUSE to flush, so it runs without blocking the GUI
+        if on_done:
+            # Dropped if the tree is cleared (e.g. another backup picked) before it runs
+            on_done = functools.partial(self._run_if_current, self._tree_generation, on_done)
+
+        if self._unmount_process is not None:
+            # One borg umount at a time; only the latest caller continues when it finishes
+            self._unmount_on_done = on_done
+            return
+
+        if not self._is_mounted:
+            if on_done:
+                on_done()
+            return
 
+        mount_path = self.mounted_backup_path
+        print(f"Unmounting {mount_path}")
+        process = QProcess(self)
+        # Passphrase might be needed for unmount if the mount command used it
+        environment = QProcessEnvironment.systemEnvironment()
+        if self.borg_passphrase:
+            environment.insert("BORG_PASSPHRASE", self.borg_passphrase)
+        process.setProcessEnvironment(environment)
+        process.finished.connect(functools.partial(self._on_unmount_finished, process, mount_path))
+        process.errorOccurred.connect(functools.partial(self._on_unmount_error, process, mount_path))
+        self._unmount_process = process
+        self._unmount_on_done = on_done
+        process.start("borg", ["umount", mount_path])
+
+    def _run_if_current(self, generation, callback):
+        if generation == self._tree_generation:
+            callback()
+
+    def _on_unmount_error(self, process, mount_path, error):
+        # finished is never emitted when borg cannot be started, which would leave waiters stuck
+        if error == QProcess.FailedToStart:
+            self._on_unmount_finished(process, mount_path, -1)
+
+    def _on_unmount_finished(self, process, mount_path, exit_code=0, exit_status=None):
+        on_done = self._unmount_on_done
+        self._unmount_process = None
+        self._unmount_on_done = None
+
+        if exit_code != 0:
+            stderr = process.readAllStandardError().data().decode()
+            QMessageBox.critical(self, "Unmount Error", f"Failed to unmount {mount_path}:\n{stderr}")
+        else:
+            print(f"Successfully unmounted {mount_path}")
+
+        if self.mounted_backup_path == mount_path:
+            self.mounted_backup_path = None
+            self._is_mounted = False
+        process.finished.disconnect()
+        process.errorOccurred.disconnect()
         process.deleteLater()
 
-    def unmount_current_backup(self):
-        if self.mounted_backup_path and os.path.ismount(self.mounted_backup_path):
-            print(f"Unmounting {self.mounted_backup_path}")
+        if on_done:
+            on_done()
+
+    def _cleanup_stale_mounts(self):
+        # Mount points left behind by earlier runs that did not exit cleanly
+        try:
+            with os.scandir(tempfile.gettempdir()) as it:
+                stale = [entry.path for entry in it if entry.name.startswith("pika_mount_")]
+        except OSError:
+            return
+
+        for path in stale:
+            pid = path.rpartition("_")[2]
+            if path == self.mount_root or (pid.isdigit() and _pid_alive(int(pid))):
+                continue
             try:
-                # Passphrase might be needed for unmount if the mount command used it
-                # Use the stored passphrase
-                env = os.environ.copy()
-                if self.borg_passphrase:
-                    env["BORG_PASSPHRASE"] = self.borg_passphrase
-
-                subprocess.run(["borg", "umount", self.mounted_backup_path], check=True, capture_output=True, env=env)
-                print(f"Successfully unmounted {self.mounted_backup_path}")
-            except subprocess.CalledProcessError as e:
-                QMessageBox.critical(self, "Unmount Error", f"Failed to unmount {self.mounted_backup_path}:\n{e.stderr.decode()}")
-            except Exception as e:
-                QMessageBox.critical(self, "Unmount Error", f"An unexpected error occurred during unmount: {e}")
-            finally:
-                if os.path.exists(self.mounted_backup_path) and not os.listdir(self.mounted_backup_path):
-                    os.rmdir(self.mounted_backup_path)
-                self.mounted_backup_path = None
+                os.rmdir(path)
+            except OSError:
+                # Still mounted (or not empty): release it and try again afterwards
+                print(f"Unmounting stale mount {path}")
+                process = QProcess(self)
+                process.finished.connect(functools.partial(self._on_stale_unmount_finished, process, path))
+                process.start("borg", ["umount", path])
+
+    def _on_stale_unmount_finished(self, process, path, exit_code=0, exit_status=None):
+        try:
+            os.rmdir(path)
+        except OSError as e:
+            print(f"Could not remove stale mount point {path}: {e}")
+        process.finished.disconnect()
+        process.deleteLater()
 
     def closeEvent(self, event):
-        self.unmount_current_backup()
+        # Keep the window until the archive is released, then close again
+        if self._is_mounted:
+            event.ignore()
+            self._unmount_async(self.close)
+            return
+        try:
+            os.rmdir(self.mount_root)
+        except OSError as e:
+            print(f"Could not remove mount point {self.mount_root}: {e}")
         super().closeEvent(event)
 
-
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = PikaBackupApp()
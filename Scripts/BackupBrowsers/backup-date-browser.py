@@ -8,109 +8,258 @@ import sys
 import shutil
 import subprocess
 import json
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import parse_qs, unquote
+import codecs
+import gzip
+import zlib
+import hashlib
+import secrets
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs, quote, unquote
 from pathlib import Path
-import mimetypes
 import webbrowser
 import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from stat import S_ISDIR
+from string import Template
 
-class BackupDateBrowserHandler(BaseHTTPRequestHandler):
-    
-    def __init__(self, *args, repo_path=None, recovery_path=None, temp_path=None, **kwargs):
-        self.repo_path = repo_path
-        self.recovery_path = recovery_path
-        self.temp_path = temp_path
-        self.current_mount = None
-        self.mount_point = "/home/herb/backup-browser-mount"
-        super().__init__(*args, **kwargs)
-    
-    def do_GET(self):
-        if self.path == '/':
-            self.serve_archive_selector()
-        elif self.path.startswith('/mount'):
-            self.mount_archive()
-        elif self.path.startswith('/browse'):
-            self.serve_directory_listing()
-        elif self.path.startswith('/copy'):
-            self.copy_file()
-        elif self.path.startswith('/temp'):
-            self.copy_to_temp()
-        elif self.path.startswith('/preview'):
-            self.preview_file()
-        elif self.path.startswith('/unmount'):
-            self.unmount_current()
-        else:
-            self.send_error(404)
-    
-    def get_archive_list(self):
-        """Get list of all backup archives with dates"""
+# Optional in-process access to the borg library (no borg fork per listing)
+try:
+    from borg.repository import Repository as BorgRepository
+    try:
+        from borg.manifest import Manifest as BorgManifest
+    except ImportError:
+        from borg.helpers import Manifest as BorgManifest
+    BORG_LIBRARY_AVAILABLE = True
+except ImportError:
+    BORG_LIBRARY_AVAILABLE = False
+
+# zstandard compresses pages faster than gzip for browsers that accept it
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Worker threads serving connections; override with PIKA_MAX_HTTP_THREADS.
+# Each one is held for a whole keep-alive connection or event stream, not
+# a single request, so the floor stays high even on small machines
+DEFAULT_HTTP_THREADS = max(32, (os.cpu_count() or 1) * 4)
+
+# Parallel stat calls per server; borg's FUSE daemon answers them concurrently
+STAT_PREFETCH_WORKERS = 16
+
+# Seconds an idle keep-alive connection may wait for its next request
+KEEPALIVE_TIMEOUT = 5
+
+# Seconds a finished mount job waits to be polled before it is dropped
+JOB_TTL = 600
+
+# Answers borg's "unknown/relocated repository" prompts instead of piping "y" through a shell
+BORG_ENV = dict(
+    os.environ,
+    BORG_UNKNOWN_UNENCRYPTED_REPO_ACCESS_IS_OK='yes',
+    BORG_RELOCATED_REPO_ACCESS_IS_OK='yes',
+)
+
+# Parsed `borg list` output per repository: repo_path -> (index_mtime, fetched_at, archives)
+ARCHIVE_CACHE_TTL = 60
+_ARCHIVE_CACHE = {}
+_ARCHIVE_CACHE_LOCK = threading.Lock()
+
+
+def _repo_index_mtime(repo_path):
+    """Modification time of the repository index, which changes whenever an archive is added"""
+    try:
+        with os.scandir(repo_path) as it:
+            mtimes = [entry.stat().st_mtime_ns for entry in it
+                      if entry.name.startswith('index.') or entry.name == 'config']
+    except OSError:
+        return None
+    return max(mtimes, default=None)
+
+
+# Bytes handed to a single sendfile call when recovering a file
+SENDFILE_CHUNK = 1 << 24
+
+
+def _copy_file_with_metadata(src_fd, src_stat, src_path, dest_path):
+    """Copy the open src_fd like shutil.copy2, moving the data in-kernel with sendfile"""
+    if hasattr(os, 'posix_fadvise'):
+        # Let the kernel read ahead in large requests instead of page-sized FUSE reads
+        os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    dest_fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, src_stat.st_mode & 0o777)
+    try:
         try:
-            result = subprocess.run(
-                ['bash', '-c', f'echo "y" | borg list "{self.repo_path}"'],
-                capture_output=True, text=True, check=False
-            )
-            
-            if result.returncode != 0:
-                return []
-            
-            archives = []
-            for line in result.stdout.strip().split('\n'):
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        archive_name = parts[0]
-                        # Parse date and time
-                        date_str = parts[2] + " " + parts[3]
-                        try:
-                            # Convert to readable format
-                            dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-                            readable_date = dt.strftime("%B %d, %Y at %I:%M %p")
-                        except:
-                            readable_date = date_str
-                        
-                        archives.append({
-                            'name': archive_name,
-                            'date': readable_date,
-                            'raw_date': date_str
-                        })
-            
-            return list(reversed(archives))  # Most recent first
-            
-        except Exception as e:
-            print(f"Error getting archive list: {e}")
-            return []
-    
-    def serve_archive_selector(self):
-        archives = self.get_archive_list()
-        
-        archive_options = ""
-        for i, archive in enumerate(archives):
-            archive_options += f"""
+            while os.sendfile(dest_fd, src_fd, None, SENDFILE_CHUNK):
+                pass
+        except OSError:
+            # Some filesystems refuse sendfile; finish with a plain copy
+            os.lseek(src_fd, 0, os.SEEK_SET)
+            os.ftruncate(dest_fd, 0)
+            os.lseek(dest_fd, 0, os.SEEK_SET)
+            with open(src_fd, 'rb', closefd=False) as src, open(dest_fd, 'wb', closefd=False) as dest:
+                shutil.copyfileobj(src, dest)
+    finally:
+        os.close(dest_fd)
+    shutil.copystat(src_path, dest_path)
+
+
+# Mixed into every ETag so pages cached by a previous server run are never reused
+_ETAG_SALT = str(time.time_ns())
+
+
+def _accepted_encodings(header):
+    """Content codings named in an Accept-Encoding header, minus those sent with q=0"""
+    accepted = set()
+    for token in header.lower().split(','):
+        name, _, param = token.partition(';')
+        param = param.strip().replace(' ', '')
+        if param.startswith('q='):
+            try:
+                if float(param[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip())
+    return accepted
+
+
+# Listing rows written per chunk while streaming a directory
+STREAM_BATCH_ROWS = 200
+
+
+class _PageStream:
+    """Response body written in pieces, compressed and chunk-framed as negotiated"""
+
+    def __init__(self, wfile, encoding, chunked, zstd_compressor=None):
+        self.wfile = wfile
+        self.chunked = chunked
+        if encoding == 'zstd':
+            self.compressor = zstd_compressor.compressobj()
+            self.flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        elif encoding == 'gzip':
+            self.compressor = zlib.compressobj(1, zlib.DEFLATED, 31)
+            self.flush_mode = zlib.Z_SYNC_FLUSH
+        else:
+            self.compressor = None
+
+    def write(self, data):
+        if self.compressor is not None:
+            # Flush each piece so the browser can render it before the page is complete
+            data = self.compressor.compress(data) + self.compressor.flush(self.flush_mode)
+        self._send(data)
+        self.wfile.flush()
+
+    def close(self):
+        if self.compressor is not None:
+            self._send(self.compressor.flush())
+        if self.chunked:
+            self.wfile.write(b'0\r\n\r\n')
+        self.wfile.flush()
+
+    def _send(self, data):
+        if not data:
+            return  # An empty chunk would end a chunked body early
+        if self.chunked:
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        else:
+            self.wfile.write(data)
+
+
+# Bytes of a file shown in the preview pane
+PREVIEW_BYTES = 10000
+
+def _entry_stat(entry):
+    """Stat a DirEntry without following symlinks, or None if it can't be read"""
+    try:
+        return entry.stat(follow_symlinks=False)
+    except OSError:
+        return None
+
+
+# Extensions the preview pane shows as text
+_PREVIEW_EXTS = frozenset({
+    '.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml', '.yaml', '.yml',
+    '.sh', '.bat', '.ps1', '.ini', '.cfg', '.conf', '.log', '.sql', '.csv'
+})
+
+_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
+def _format_size(size_bytes):
+    """Format a byte count with the largest binary unit it reaches"""
+    idx = min(max(0, (size_bytes.bit_length() - 1) // 10), len(_UNITS) - 1)
+    if idx == 0:
+        return f"{size_bytes} B"
+    return f"{size_bytes / (1 << (10 * idx)):.1f} {_UNITS[idx]}"
+
+
+# Single-pass escapes for text placed in HTML and in quoted JavaScript strings
+_HTML_TR = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'})
+_JS_TR = str.maketrans({'\\': '\\\\', "'": "\\'", '"': '\\"', '<': '\\u003c',
+                        '\n': '\\n', '\r': '\\r'})
+
+
+def _html(text):
+    return text.translate(_HTML_TR)
+
+
+def _js_attr(text):
+    """Escape text for a JS string literal inside an HTML attribute"""
+    return text.translate(_JS_TR).translate(_HTML_TR)
+
+
+# Directory listing row templates, filled from the per-entry item dicts
+_DIR_ROW = """
+                    <div class="file-item">
+                        <a href="/browse?path={path}&date={archive_date}" class="directory-item">📁 {name}</a>
+                        <span class="file-date">{date}</span>
+                        <span class="file-size">--</span>
+                        <span>--</span>
+                    </div>
+                    """.format_map
+
+_FILE_ROW = """
+                    <div class="file-item">
+                        <span>📄 {name}</span>
+                        <span class="file-date">{date}</span>
+                        <span class="file-size">{size}</span>
+                        <div class="button-group">
+                            {preview_button}
+                            <button class="temp-btn" onclick="tempCopy('{js_path}', '{js_name}')">Temp</button>
+                            <button class="copy-btn" onclick="copyFile('{js_path}', '{js_name}')">Copy</button>
+                        </div>
+                    </div>
+                    """.format_map
+
+_PREVIEW_BUTTON = """<button class="preview-btn" onclick="previewFile('{js_path}', '{js_name}')">Preview</button>""".format_map
+
+# Static page fragments are encoded once; only the dynamic parts are formatted per request
+_ARCHIVE_ITEM = """
             <div class="archive-item">
                 <div class="archive-info">
-                    <strong>{archive['date']}</strong><br>
-                    <small>Archive: {archive['name']}</small>
+                    <strong>{date}</strong><br>
+                    <small>Archive: {name}</small>
                 </div>
-                <button class="mount-btn" onclick="mountArchive('{archive['name']}', '{archive['date']}')">
+                <button class="mount-btn" onclick="mountArchive('{js_name}', '{js_date}')">
                     Browse This Backup
                 </button>
             </div>
-            """
-        
-        html = f"""
+            """.format_map
+
+_SELECTOR_HEAD = """
         <!DOCTYPE html>
         <html>
         <head>
             <title>Pika Backup Date Selector</title>
             <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
-                .header {{ background: #2196F3; color: white; padding: 20px; border-radius: 8px; text-align: center; }}
-                .container {{ max-width: 800px; margin: 0 auto; }}
-                .archive-list {{ margin: 20px 0; }}
-                .archive-item {{ 
+                body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
+                .header { background: #2196F3; color: white; padding: 20px; border-radius: 8px; text-align: center; }
+                .container { max-width: 800px; margin: 0 auto; }
+                .archive-list { margin: 20px 0; }
+                .archive-item { 
                     background: white; 
                     margin: 10px 0; 
                     padding: 15px; 
@@ -119,10 +268,10 @@ class BackupDateBrowserHandler(BaseHTTPRequestHandler):
                     justify-content: space-between; 
                     align-items: center;
                     box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                }}
-                .archive-item:hover {{ box-shadow: 0 4px 8px rgba(0,0,0,0.15); }}
-                .archive-info {{ flex-grow: 1; }}
-                .mount-btn {{ 
+                }
+                .archive-item:hover { box-shadow: 0 4px 8px rgba(0,0,0,0.15); }
+                .archive-info { flex-grow: 1; }
+                .mount-btn { 
                     background: #4CAF50; 
                     color: white; 
                     border: none; 
@@ -130,29 +279,29 @@ class BackupDateBrowserHandler(BaseHTTPRequestHandler):
                     border-radius: 5px; 
                     cursor: pointer;
                     font-size: 14px;
-                }}
-                .mount-btn:hover {{ background: #45a049; }}
-                #status {{ 
+                }
+                .mount-btn:hover { background: #45a049; }
+                #status { 
                     margin: 20px 0; 
                     padding: 15px; 
                     background: #dff0d8; 
                     border-radius: 5px; 
                     display: none; 
-                }}
-                .info-box {{ 
+                }
+                .info-box { 
                     background: white; 
                     padding: 15px; 
                     border-radius: 8px; 
                     margin: 20px 0;
                     box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                }}
-                .current-mount {{ 
+                }
+                .current-mount { 
                     background: #e3f2fd; 
                     border-left: 4px solid #2196F3; 
                     padding: 15px; 
                     margin: 20px 0; 
                     border-radius: 0 8px 8px 0;
-                }}
+                }
             </style>
         </head>
         <body>
@@ -164,17 +313,21 @@ class BackupDateBrowserHandler(BaseHTTPRequestHandler):
                 
                 <div id="status"></div>
                 
-                <div class="info-box">
-                    <h3>📊 Available Backups: {len(archives)}</h3>
+""".encode()
+
+_SELECTOR_BODY = Template("""                <div class="info-box">
+                    <h3>📊 Available Backups: $count</h3>
                     <p>Select a backup date below to browse files with their original timestamps.</p>
-                    <p><strong>Repository:</strong> {self.repo_path}</p>
+                    <p><strong>Repository:</strong> $repo_path</p>
                 </div>
                 
                 <div class="archive-list">
-                    {archive_options}
+                    $archive_options
                 </div>
                 
-                <div class="info-box">
+""")
+
+_SELECTOR_TAIL = """                <div class="info-box">
                     <h3>💡 How to Use:</h3>
                     <ul>
                         <li>Click "Browse This Backup" for any date</li>
@@ -187,183 +340,79 @@ class BackupDateBrowserHandler(BaseHTTPRequestHandler):
             </div>
             
             <script>
-                function mountArchive(archiveName, archiveDate) {{
+                function mountArchive(archiveName, archiveDate) {
                     showStatus('Mounting backup from ' + archiveDate + '...');
                     
                     fetch('/mount?archive=' + encodeURIComponent(archiveName) + '&date=' + encodeURIComponent(archiveDate))
-                    .then(response => response.text())
-                    .then(data => {{
-                        if (data.includes('success')) {{
+                    .then(response => response.json())
+                    .then(data => waitForMount(data.job, archiveDate))
+                    .catch(error => {
+                        showStatus('Error: ' + error);
+                    });
+                }
+                
+                function waitForMount(jobId, archiveDate) {
+                    fetch('/mount/status?id=' + encodeURIComponent(jobId))
+                    .then(response => response.json())
+                    .then(data => {
+                        if (data.state === 'pending') {
+                            setTimeout(() => waitForMount(jobId, archiveDate), 500);
+                        } else if (data.state === 'done') {
                             window.location.href = '/browse?path=&date=' + encodeURIComponent(archiveDate);
-                        }} else {{
-                            showStatus('Error mounting backup: ' + data);
-                        }}
-                    }})
-                    .catch(error => {{
+                        } else {
+                            showStatus('Error mounting backup: ' + data.message);
+                        }
+                    })
+                    .catch(error => {
                         showStatus('Error: ' + error);
-                    }});
-                }}
+                    });
+                }
                 
-                function showStatus(message) {{
+                function showStatus(message) {
                     document.getElementById('status').style.display = 'block';
-                    document.getElementById('status').innerHTML = message;
-                }}
+                    document.getElementById('status').textContent = message;
+                }
             </script>
         </body>
         </html>
-        """
-        
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        self.wfile.write(html.encode())
-    
-    def mount_archive(self):
-        query = self.path.split('?', 1)[1] if '?' in self.path else ''
-        params = parse_qs(query)
-        archive_name = params.get('archive', [''])[0]
-        archive_date = params.get('date', [''])[0]
-        
-        if not archive_name:
-            self.send_error(400, "Archive name required")
-            return
-        
-        try:
-            # Unmount any existing archive
-            if os.path.ismount(self.mount_point):
-                subprocess.run(['borg', 'umount', self.mount_point], 
-                             capture_output=True, check=False)
-            
-            # Create mount point
-            os.makedirs(self.mount_point, exist_ok=True)
-            
-            # Mount the archive
-            full_archive_path = f"{self.repo_path}::{archive_name}"
-            result = subprocess.run(
-                ['bash', '-c', f'echo "y" | borg mount "{full_archive_path}" "{self.mount_point}"'],
-                capture_output=True, text=True, check=False
-            )
-            
-            if result.returncode == 0:
-                self.current_mount = {'archive': archive_name, 'date': archive_date}
-                self.send_response(200)
-                self.send_header('Content-type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(f"success: Mounted {archive_name}".encode())
-            else:
-                self.send_error(500, f"Failed to mount: {result.stderr}")
-                
-        except Exception as e:
-            self.send_error(500, str(e))
-    
-    def serve_directory_listing(self):
-        if not self.current_mount:
-            self.send_error(400, "No archive mounted")
-            return
-        
-        query = self.path.split('?', 1)[1] if '?' in self.path else ''
-        params = parse_qs(query)
-        rel_path = params.get('path', [''])[0]
-        archive_date = params.get('date', ['Current Archive'])[0]
-        
-        full_path = os.path.join(self.mount_point, "home/herb", rel_path)
-        
-        if not os.path.exists(full_path):
-            self.send_error(404, "Path not found")
-            return
-        
-        try:
-            items = []
-            
-            # Add parent directory link if not at root
-            if rel_path:
-                parent_path = '/'.join(rel_path.split('/')[:-1])
-                items.append({
-                    'name': '..',
-                    'is_dir': True,
-                    'path': parent_path,
-                    'size': '',
-                    'date': ''
-                })
-            
-            # List directory contents with original dates
-            for item in sorted(os.listdir(full_path)):
-                if item.startswith('.'):
-                    continue
-                    
-                item_path = os.path.join(full_path, item)
-                rel_item_path = os.path.join(rel_path, item) if rel_path else item
-                
-                is_dir = os.path.isdir(item_path)
-                size = ''
-                mod_date = ''
-                
-                try:
-                    stat = os.stat(item_path)
-                    # Get modification time from backup
-                    mod_timestamp = stat.st_mtime
-                    mod_date = datetime.fromtimestamp(mod_timestamp).strftime("%Y-%m-%d %H:%M")
-                    
-                    if not is_dir:
-                        size_bytes = stat.st_size
-                        if size_bytes < 1024:
-                            size = f"{size_bytes} B"
-                        elif size_bytes < 1024*1024:
-                            size = f"{size_bytes/1024:.1f} KB"
-                        elif size_bytes < 1024*1024*1024:
-                            size = f"{size_bytes/(1024*1024):.1f} MB"
-                        else:
-                            size = f"{size_bytes/(1024*1024*1024):.1f} GB"
-                except:
-                    size = "Unknown"
-                    mod_date = "Unknown"
-                
-                items.append({
-                    'name': item,
-                    'is_dir': is_dir,
-                    'path': rel_item_path,
-                    'full_path': item_path,
-                    'size': size,
-                    'date': mod_date
-                })
-            
-            # Generate HTML
-            breadcrumb = self.generate_breadcrumb(rel_path, archive_date)
-            
-            html = f"""
+        """.encode()
+
+_LISTING_HEAD = Template("""
             <!DOCTYPE html>
             <html>
             <head>
-                <title>Backup Browser - {archive_date}</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                    .header {{ background: #2196F3; color: white; padding: 15px; border-radius: 5px; }}
-                    .archive-info {{ background: #e3f2fd; padding: 10px; border-radius: 5px; margin: 10px 0; }}
-                    .breadcrumb {{ margin: 10px 0; padding: 10px; background: #f5f5f5; border-radius: 5px; }}
-                    .breadcrumb a {{ color: #2196F3; text-decoration: none; margin-right: 5px; }}
-                    .file-list {{ margin: 10px 0; }}
-                    .file-item {{ 
+                <title>Backup Browser - $archive_date</title>
+""")
+
+_LISTING_STYLE = b"""                <style>
+                    body { font-family: Arial, sans-serif; margin: 20px; }
+                    .header { background: #2196F3; color: white; padding: 15px; border-radius: 5px; }
+                    .archive-info { background: #e3f2fd; padding: 10px; border-radius: 5px; margin: 10px 0; }
+                    .breadcrumb { margin: 10px 0; padding: 10px; background: #f5f5f5; border-radius: 5px; }
+                    .breadcrumb a { color: #2196F3; text-decoration: none; margin-right: 5px; }
+                    .file-list { margin: 10px 0; }
+                    .file-item { 
                         padding: 8px; 
                         border-bottom: 1px solid #eee; 
                         display: grid; 
                         grid-template-columns: 2fr 1fr 1fr 1fr; 
                         gap: 10px;
                         align-items: center; 
-                    }}
-                    .file-item:hover {{ background: #f0f0f0; }}
-                    .directory-item {{ color: #2196F3; font-weight: bold; }}
-                    .file-date {{ color: #666; font-size: 0.9em; }}
-                    .file-size {{ color: #666; font-size: 0.9em; }}
-                    .button-group {{ display: flex; gap: 2px; }}
-                    .copy-btn {{ background: #4CAF50; color: white; border: none; padding: 4px 8px; border-radius: 3px; cursor: pointer; font-size: 0.8em; }}
-                    .temp-btn {{ background: #FF9800; color: white; border: none; padding: 4px 8px; border-radius: 3px; cursor: pointer; font-size: 0.8em; }}
-                    .preview-btn {{ background: #9C27B0; color: white; border: none; padding: 4px 8px; border-radius: 3px; cursor: pointer; font-size: 0.8em; }}
-                    .copy-btn:hover {{ background: #45a049; }}
-                    .temp-btn:hover {{ background: #e68900; }}
-                    .preview-btn:hover {{ background: #7B1FA2; }}
-                    #status {{ margin: 10px 0; padding: 10px; background: #dff0d8; border-radius: 5px; display: none; }}
-                    #preview {{ margin: 10px 0; padding: 10px; background: #f9f9f9; border-radius: 5px; display: none; max-height: 400px; overflow: auto; }}
-                    .header-row {{ 
+                    }
+                    .file-item:hover { background: #f0f0f0; }
+                    .directory-item { color: #2196F3; font-weight: bold; }
+                    .file-date { color: #666; font-size: 0.9em; }
+                    .file-size { color: #666; font-size: 0.9em; }
+                    .button-group { display: flex; gap: 2px; }
+                    .copy-btn { background: #4CAF50; color: white; border: none; padding: 4px 8px; border-radius: 3px; cursor: pointer; font-size: 0.8em; }
+                    .temp-btn { background: #FF9800; color: white; border: none; padding: 4px 8px; border-radius: 3px; cursor: pointer; font-size: 0.8em; }
+                    .preview-btn { background: #9C27B0; color: white; border: none; padding: 4px 8px; border-radius: 3px; cursor: pointer; font-size: 0.8em; }
+                    .copy-btn:hover { background: #45a049; }
+                    .temp-btn:hover { background: #e68900; }
+                    .preview-btn:hover { background: #7B1FA2; }
+                    #status { margin: 10px 0; padding: 10px; background: #dff0d8; border-radius: 5px; display: none; }
+                    #preview { margin: 10px 0; padding: 10px; background: #f9f9f9; border-radius: 5px; display: none; max-height: 400px; overflow: auto; }
+                    .header-row { 
                         font-weight: bold; 
                         background: #f0f0f0; 
                         padding: 10px 8px; 
@@ -371,14 +420,16 @@ class BackupDateBrowserHandler(BaseHTTPRequestHandler):
                         grid-template-columns: 2fr 1fr 1fr 1fr; 
                         gap: 10px;
                         border-bottom: 2px solid #ddd;
-                    }}
+                    }
                 </style>
-            </head>
+"""
+
+_LISTING_BODY = Template("""            </head>
             <body>
                 <div class="header">
                     <h1>🐭 Pika Backup Browser</h1>
                     <div style="display: flex; justify-content: space-between; align-items: center;">
-                        <span>Backup Date: {archive_date}</span>
+                        <span>Backup Date: $archive_date</span>
                         <div>
                             <a href="/" style="color: white; text-decoration: none; margin-right: 15px;">📅 Change Date</a>
                             <a href="/unmount" style="color: white; text-decoration: none;">🔒 Unmount</a>
@@ -390,7 +441,7 @@ class BackupDateBrowserHandler(BaseHTTPRequestHandler):
                 <div id="preview"></div>
                 
                 <div class="breadcrumb">
-                    {breadcrumb}
+                    $breadcrumb
                 </div>
                 
                 <div class="header-row">
@@ -401,184 +452,602 @@ class BackupDateBrowserHandler(BaseHTTPRequestHandler):
                 </div>
                 
                 <div class="file-list">
-            """
-            
-            for item in items:
-                if item['is_dir']:
-                    html += f"""
-                    <div class="file-item">
-                        <a href="/browse?path={item['path']}&date={archive_date}" class="directory-item">📁 {item['name']}</a>
-                        <span class="file-date">{item['date']}</span>
-                        <span class="file-size">--</span>
-                        <span>--</span>
-                    </div>
-                    """
-                else:
-                    can_preview = self.can_preview_file(item['name'])
-                    preview_button = f'<button class="preview-btn" onclick="previewFile(\'{item["full_path"]}\', \'{item["name"]}\')">Preview</button>' if can_preview else ''
-                    
-                    html += f"""
-                    <div class="file-item">
-                        <span>📄 {item['name']}</span>
-                        <span class="file-date">{item['date']}</span>
-                        <span class="file-size">{item['size']}</span>
-                        <div class="button-group">
-                            {preview_button}
-                            <button class="temp-btn" onclick="tempCopy('{item['full_path']}', '{item['name']}')">Temp</button>
-                            <button class="copy-btn" onclick="copyFile('{item['full_path']}', '{item['name']}')">Copy</button>
-                        </div>
-                    </div>
-                    """
-            
-            html += f"""
+            """)
+
+_LISTING_TAIL = """
                 </div>
                 
                 <script>
-                    function copyFile(filePath, fileName) {{
+                    function copyFile(filePath, fileName) {
                         fetch('/copy?file=' + encodeURIComponent(filePath))
                         .then(response => response.text())
                         .then(data => showStatus('Permanently copied: ' + fileName + ' to RecoveredFiles/'));
-                    }}
+                    }
                     
-                    function tempCopy(filePath, fileName) {{
+                    function tempCopy(filePath, fileName) {
                         fetch('/temp?file=' + encodeURIComponent(filePath))
                         .then(response => response.text())
                         .then(data => showStatus('Temp copied: ' + fileName + ' to TempPreview/'));
-                    }}
+                    }
                     
-                    function previewFile(filePath, fileName) {{
+                    function previewFile(filePath, fileName) {
                         fetch('/preview?file=' + encodeURIComponent(filePath))
-                        .then(response => response.text())
-                        .then(data => {{
-                            document.getElementById('preview').style.display = 'block';
-                            document.getElementById('preview').innerHTML = '<h3>Preview: ' + fileName + '</h3><pre style="white-space: pre-wrap; word-wrap: break-word;">' + data + '</pre>';
-                            document.getElementById('preview').scrollIntoView();
-                        }});
-                    }}
+                        .then(response => response.json())
+                        .then(data => {
+                            // Text nodes show the file verbatim; nothing in it is parsed as markup
+                            const title = document.createElement('h3');
+                            title.textContent = 'Preview: ' + fileName;
+                            const text = document.createElement('pre');
+                            text.style.cssText = 'white-space: pre-wrap; word-wrap: break-word;';
+                            text.textContent = data.text;
+                            
+                            const preview = document.getElementById('preview');
+                            preview.replaceChildren(title, text);
+                            preview.style.display = 'block';
+                            preview.scrollIntoView();
+                        });
+                    }
                     
-                    function showStatus(message) {{
+                    function showStatus(message) {
                         document.getElementById('status').style.display = 'block';
-                        document.getElementById('status').innerHTML = message;
-                        setTimeout(() => {{
+                        document.getElementById('status').textContent = message;
+                        setTimeout(() => {
                             document.getElementById('status').style.display = 'none';
-                        }}, 4000);
-                    }}
+                        }, 4000);
+                    }
                 </script>
             </body>
             </html>
-            """
+            """.encode()
+
+
+class BackupBrowserServer(ThreadingHTTPServer):
+    """Threaded HTTP server that runs requests on a bounded worker pool"""
+
+    def __init__(self, server_address, handler_class, max_workers=None):
+        super().__init__(server_address, handler_class)
+        if max_workers is None:
+            max_workers = int(os.environ.get('PIKA_MAX_HTTP_THREADS') or DEFAULT_HTTP_THREADS)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='http')
+        # Separate from the request pool so listings never wait on their own workers
+        self.stat_executor = ThreadPoolExecutor(max_workers=STAT_PREFETCH_WORKERS, thread_name_prefix='stat')
+        # Mounts get their own worker so idle keep-alive connections can't hold them up
+        self.mount_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mount')
+        # The mount point is shared by every handler, so its state lives here
+        self.mount_lock = threading.Lock()
+        self.current_mount = None
+        # Background mounts by job id, polled through /mount/status
+        self.jobs = {}
+        self.jobs_lock = threading.Lock()
+        # Compressors are not thread-safe, so each worker keeps its own
+        self.compressors = threading.local()
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def zstd_compressor(self):
+        compressor = getattr(self.compressors, 'zstd', None)
+        if compressor is None:
+            compressor = self.compressors.zstd = zstandard.ZstdCompressor(level=3)
+        return compressor
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+        self.stat_executor.shutdown(wait=False)
+        self.mount_executor.shutdown(wait=False)
+
+
+class BackupDateBrowserHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests; every response carries a length or is chunked
+    protocol_version = 'HTTP/1.1'
+    # Buffer headers and body into one send; streamed pages flush per batch
+    wbufsize = 1 << 16
+    # Idle keep-alive connections hold a pool worker, so let them go quickly
+    timeout = KEEPALIVE_TIMEOUT
+    
+    def __init__(self, *args, repo_path=None, recovery_path=None, temp_path=None, **kwargs):
+        self.repo_path = repo_path
+        self.recovery_path = recovery_path
+        self.temp_path = temp_path
+        self.mount_point = "/home/herb/backup-browser-mount"
+        super().__init__(*args, **kwargs)
+    
+    def do_GET(self):
+        if self.path == '/':
+            self.serve_archive_selector()
+        elif self.path.startswith('/mount/status'):
+            self.mount_status()
+        elif self.path.startswith('/mount'):
+            self.mount_archive()
+        elif self.path.startswith('/browse'):
+            self.serve_directory_listing()
+        elif self.path.startswith('/copy'):
+            self.copy_file()
+        elif self.path.startswith('/temp'):
+            self.copy_to_temp()
+        elif self.path.startswith('/preview'):
+            self.preview_file()
+        elif self.path.startswith('/unmount'):
+            self.unmount_current()
+        else:
+            self.send_error(404)
+    
+    def get_archive_list(self):
+        """Get list of all backup archives with dates, reusing a recent listing"""
+        index_mtime = _repo_index_mtime(self.repo_path)
+        with _ARCHIVE_CACHE_LOCK:
+            cached = _ARCHIVE_CACHE.get(self.repo_path)
+            if (cached and cached[0] == index_mtime
+                    and time.monotonic() - cached[1] < ARCHIVE_CACHE_TTL):
+                return cached[2]
             
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            self.wfile.write(html.encode())
+            # Fetching under the cache lock also keeps borg repository access sequential
+            archives = self.fetch_archive_list()
+            if archives:
+                _ARCHIVE_CACHE[self.repo_path] = (index_mtime, time.monotonic(), archives)
+            return archives
+    
+    def fetch_archive_list(self):
+        """Read the archives from the repository, most recent first"""
+        if BORG_LIBRARY_AVAILABLE:
+            try:
+                return self.list_archives_in_process()
+            except Exception:
+                pass  # Fall back to the borg command line
+        
+        try:
+            result = subprocess.run(
+                ['borg', 'list', '--json', self.repo_path],
+                capture_output=True, text=True, check=False, env=BORG_ENV
+            )
+            
+            if result.returncode != 0:
+                return []
+            
+            archives = []
+            for archive in json.loads(result.stdout).get('archives', []):
+                dt = datetime.fromisoformat(archive['time'])
+                archives.append({
+                    'name': archive['name'],
+                    'date': dt.strftime("%B %d, %Y at %I:%M %p"),
+                    'raw_date': dt.isoformat(sep=' ', timespec='seconds')
+                })
+            
+            return list(reversed(archives))  # Most recent first
             
         except Exception as e:
-            self.send_error(500, str(e))
+            print(f"Error getting archive list: {e}")
+            return []
     
-    def can_preview_file(self, filename):
-        text_extensions = {'.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml', '.yaml', '.yml', 
-                          '.sh', '.bat', '.ps1', '.ini', '.cfg', '.conf', '.log', '.sql', '.csv'}
-        _, ext = os.path.splitext(filename.lower())
-        return ext in text_extensions
+    def list_archives_in_process(self):
+        """Read the archive list through the borg library without forking borg"""
+        archives = []
+        with BorgRepository(self.repo_path, exclusive=False) as repository:
+            loaded = BorgManifest.load(repository, (BorgManifest.Operation.READ,))
+            manifest = loaded[0] if isinstance(loaded, tuple) else loaded
+            
+            for info in manifest.archives.list(sort_by=['ts']):
+                ts = info.ts if info.ts.tzinfo else info.ts.replace(tzinfo=timezone.utc)
+                dt = ts.astimezone().replace(tzinfo=None)
+                archives.append({
+                    'name': info.name,
+                    'date': dt.strftime("%B %d, %Y at %I:%M %p"),
+                    'raw_date': dt.isoformat(sep=' ', timespec='seconds')
+                })
+        
+        return list(reversed(archives))  # Most recent first
     
-    def generate_breadcrumb(self, path, archive_date):
-        breadcrumb = f'<a href="/browse?path=&date={archive_date}">🏠 Home</a>'
+    def forget_archive_list_if_stale(self, archive_name):
+        """Drop the cached listing when it doesn't know about archive_name"""
+        with _ARCHIVE_CACHE_LOCK:
+            cached = _ARCHIVE_CACHE.get(self.repo_path)
+            if cached and not any(a['name'] == archive_name for a in cached[2]):
+                del _ARCHIVE_CACHE[self.repo_path]
+    
+    def serve_archive_selector(self):
+        archives = self.get_archive_list()
         
-        if path:
-            parts = path.split('/')
-            for i, part in enumerate(parts):
-                if part:
-                    partial_path = '/'.join(parts[:i+1])
-                    if i == len(parts) - 1:
-                        breadcrumb += f' > <strong>{part}</strong>'
-                    else:
-                        breadcrumb += f' > <a href="/browse?path={partial_path}&date={archive_date}">{part}</a>'
+        etag = self.check_etag(self.repo_path, *(f"{a['name']}@{a['raw_date']}" for a in archives))
+        if etag is None:
+            return
+        
+        archive_options = ''.join(
+            _ARCHIVE_ITEM({
+                'name': _html(archive['name']),
+                'date': _html(archive['date']),
+                'js_name': _js_attr(archive['name']),
+                'js_date': _js_attr(archive['date'])
+            })
+            for archive in archives
+        )
         
-        return breadcrumb
+        body = _SELECTOR_BODY.substitute(
+            count=len(archives),
+            repo_path=_html(self.repo_path),
+            archive_options=archive_options
+        ).encode()
+        
+        self.send_page([_SELECTOR_HEAD, body, _SELECTOR_TAIL], etag)
     
-    def copy_file(self):
+    def mount_archive(self):
         query = self.path.split('?', 1)[1] if '?' in self.path else ''
         params = parse_qs(query)
-        file_path = params.get('file', [''])[0]
+        archive_name = params.get('archive', [''])[0]
+        archive_date = params.get('date', [''])[0]
         
-        if not file_path or not os.path.exists(file_path):
-            self.send_error(404, "File not found")
+        if not archive_name:
+            self.send_error(400, "Archive name required")
+            return
+        
+        self.forget_archive_list_if_stale(archive_name)
+        
+        # Mounting takes seconds; hand it to the mount worker and let the page poll
+        job_id = secrets.token_hex(8)
+        future = self.server.mount_executor.submit(self.do_mount, archive_name, archive_date)
+        job = {'future': future, 'finished': None}
+        future.add_done_callback(lambda _: job.update(finished=time.monotonic()))
+        with self.server.jobs_lock:
+            # Jobs whose page went away are never polled; drop them once they go stale
+            now = time.monotonic()
+            jobs = self.server.jobs
+            for stale in [jid for jid, j in jobs.items() if j['finished'] and now - j['finished'] > JOB_TTL]:
+                del jobs[stale]
+            jobs[job_id] = job
+        
+        self.send_json({'job': job_id})
+    
+    def do_mount(self, archive_name, archive_date):
+        """Mount archive_name over the shared mount point, replacing any mounted archive"""
+        with self.server.mount_lock:
+            # Unmount any existing archive
+            if os.path.ismount(self.mount_point):
+                subprocess.run(['borg', 'umount', self.mount_point], 
+                             capture_output=True, check=False)
+            self.server.current_mount = None
+            
+            # Create mount point
+            os.makedirs(self.mount_point, exist_ok=True)
+            
+            # Mount the archive
+            full_archive_path = f"{self.repo_path}::{archive_name}"
+            result = subprocess.run(
+                ['borg', 'mount', full_archive_path, self.mount_point],
+                capture_output=True, text=True, check=False, env=BORG_ENV
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"Failed to mount: {result.stderr}")
+            
+            self.server.current_mount = {'archive': archive_name, 'date': archive_date}
+        return f"Mounted {archive_name}"
+    
+    def mount_status(self):
+        query = self.path.split('?', 1)[1] if '?' in self.path else ''
+        params = parse_qs(query)
+        job_id = params.get('id', [''])[0]
+        
+        with self.server.jobs_lock:
+            job = self.server.jobs.get(job_id)
+            # A finished job is reported once, then forgotten
+            if job is not None and job['finished']:
+                del self.server.jobs[job_id]
+        
+        if job is None:
+            self.send_error(404, "Unknown mount job")
+            return
+        
+        future = job['future']
+        if not job['finished']:
+            self.send_json({'state': 'pending'})
+        elif future.exception() is not None:
+            self.send_json({'state': 'error', 'message': str(future.exception())})
+        else:
+            self.send_json({'state': 'done', 'message': future.result()})
+    
+    def send_json(self, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8', errors='replace')
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def serve_directory_listing(self):
+        mount = self.server.current_mount
+        if not mount:
+            self.send_error(400, "No archive mounted")
+            return
+        
+        query = self.path.split('?', 1)[1] if '?' in self.path else ''
+        params = parse_qs(query)
+        rel_path = params.get('path', [''])[0].strip('/')
+        archive_date = params.get('date', ['Current Archive'])[0]
+        
+        try:
+            full_path = self.resolve_mount_path(os.path.join(self.mount_point, "home/herb", rel_path))
+        except PermissionError as e:
+            self.send_error(403, str(e))
+            return
+        url_date = quote(archive_date)
+        
+        try:
+            dir_mtime = os.stat(full_path).st_mtime_ns
+        except OSError:
+            self.send_error(404, "Path not found")
+            return
+        
+        # Archives are read-only, so a listing only changes with the mounted
+        # archive or the directory itself; answer repeat visits without a scandir
+        etag = self.check_etag(mount['archive'], rel_path, archive_date, dir_mtime)
+        if etag is None:
+            return
+        
+        try:
+            # List directory contents with original dates; DirEntry caches the
+            # type and stat, so each entry costs one lookup on the borg mount
+            with os.scandir(full_path) as it:
+                entries = sorted((e for e in it if not e.name.startswith('.')), key=lambda e: e.name)
+        except OSError as e:
+            self.send_error(500, str(e))
             return
         
+        breadcrumb = self.generate_breadcrumb(rel_path, archive_date)
+        page_head = _LISTING_HEAD.substitute(archive_date=_html(archive_date))
+        page_body = _LISTING_BODY.substitute(archive_date=_html(archive_date), breadcrumb=breadcrumb)
+        
+        # Rows are sent in batches as they are stat'ed so large folders render progressively
+        stream = self.start_page_stream(etag)
         try:
-            os.makedirs(self.recovery_path, exist_ok=True)
-            filename = os.path.basename(file_path)
-            dest_path = os.path.join(self.recovery_path, filename)
-            shutil.copy2(file_path, dest_path)
+            stream.write(page_head.encode() + _LISTING_STYLE + page_body.encode())
             
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(f"Copied {filename}".encode())
+            rows = []
+            # Add parent directory link if not at root
+            if rel_path:
+                rows.append(_DIR_ROW({
+                    'name': '..',
+                    'path': quote(rel_path.rpartition('/')[0]),
+                    'date': '',
+                    'archive_date': url_date
+                }))
+            
+            # Stats are fetched in parallel and come back in listing order
+            stats = self.server.stat_executor.map(_entry_stat, entries)
+            for entry, stat in zip(entries, stats):
+                rows.append(self.listing_row(entry, stat, rel_path, url_date))
+                if len(rows) >= STREAM_BATCH_ROWS:
+                    stream.write(''.join(rows).encode())
+                    rows.clear()
+            
+            stream.write(''.join(rows).encode() + _LISTING_TAIL)
+            stream.close()
             
         except Exception as e:
-            self.send_error(500, str(e))
+            # Headers are already out; all that is left is to drop the connection
+            self.log_error("Listing of %s aborted: %s", rel_path or '/', e)
+            self.close_connection = True
     
-    def copy_to_temp(self):
+    def listing_row(self, entry, stat, rel_path, url_date):
+        """Render one directory entry and its prefetched stat as a listing row"""
+        item = entry.name
+        rel_item_path = f"{rel_path}/{item}" if rel_path else item
+        
+        size = ''
+        
+        if stat is not None:
+            is_dir = S_ISDIR(stat.st_mode)
+            # Get modification time from backup
+            mod_date = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M")
+            
+            if not is_dir:
+                size = _format_size(stat.st_size)
+        else:
+            is_dir = False
+            size = "Unknown"
+            mod_date = "Unknown"
+        
+        fields = {
+            'name': _html(item),
+            'path': quote(rel_item_path),
+            'js_name': _js_attr(item),
+            'js_path': _js_attr(entry.path),
+            'size': size,
+            'date': mod_date,
+            'archive_date': url_date
+        }
+        if is_dir:
+            return _DIR_ROW(fields)
+        
+        fields['preview_button'] = _PREVIEW_BUTTON(fields) if self.can_preview_file(item) else ''
+        return _FILE_ROW(fields)
+    
+    def check_etag(self, *key):
+        """Return the ETag for key, or None after answering 304 because the client has it"""
+        digest = hashlib.blake2b('|'.join(map(str, (_ETAG_SALT,) + key)).encode(), digest_size=16)
+        etag = f'"{digest.hexdigest()}"'
+        
+        if etag in (tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')):
+            self.send_response(304)
+            self.send_cache_headers(etag)
+            self.end_headers()
+            return None
+        return etag
+    
+    def negotiate_encoding(self):
+        """Pick zstd or gzip from Accept-Encoding, or None for an uncompressed body"""
+        accepted = _accepted_encodings(self.headers.get('Accept-Encoding', ''))
+        if ZSTD_AVAILABLE and 'zstd' in accepted:
+            return 'zstd'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
+    
+    def send_page(self, chunks, etag):
+        """Send an HTML page, compressed when the client accepts zstd or gzip"""
+        body = b''.join(chunks)
+        encoding = self.negotiate_encoding()
+        if encoding == 'zstd':
+            body = self.server.zstd_compressor().compress(body)
+        elif encoding == 'gzip':
+            body = gzip.compress(body, compresslevel=1)
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'text/html')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_cache_headers(etag)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def start_page_stream(self, etag):
+        """Send the headers for an HTML page whose length isn't known yet"""
+        encoding = self.negotiate_encoding()
+        chunked = self.request_version == 'HTTP/1.1' and self.protocol_version == 'HTTP/1.1'
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'text/html')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_cache_headers(etag)
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            # Without chunked framing the end of the body is the end of the connection
+            self.close_connection = True
+        self.end_headers()
+        
+        zstd_compressor = self.server.zstd_compressor() if encoding == 'zstd' else None
+        return _PageStream(self.wfile, encoding, chunked, zstd_compressor)
+    
+    def send_cache_headers(self, etag):
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'private, max-age=0, must-revalidate')
+    
+    def can_preview_file(self, filename):
+        # Lower-case only the extension rather than the whole name
+        dot = filename.rfind('.')
+        return dot > 0 and filename[dot:].lower() in _PREVIEW_EXTS
+    
+    def generate_breadcrumb(self, path, archive_date):
+        archive_date = quote(archive_date)
+        breadcrumb = [f'<a href="/browse?path=&date={archive_date}">🏠 Home</a>']
+        
+        if path:
+            parts = path.split('/')
+            last = len(parts) - 1
+            partial_path = ''
+            for i, part in enumerate(parts):
+                if part:
+                    partial_path = f"{partial_path}/{part}" if partial_path else part
+                    if i == last:
+                        breadcrumb.append(f' &gt; <strong>{_html(part)}</strong>')
+                    else:
+                        breadcrumb.append(f' &gt; <a href="/browse?path={quote(partial_path)}&date={archive_date}">{_html(part)}</a>')
+        
+        return ''.join(breadcrumb)
+    
+    def resolve_mount_path(self, path):
+        """Canonicalize path, refusing anything outside the mounted archive"""
+        real = os.path.realpath(path)
+        root = os.path.realpath(self.mount_point)
+        if real != root and not real.startswith(root + os.sep):
+            raise PermissionError(f"Not inside the mounted archive: {path}")
+        return real
+    
+    def open_requested_file(self):
+        """Open the ?file= argument read-only; returns (path, fd, stat)"""
         query = self.path.split('?', 1)[1] if '?' in self.path else ''
         params = parse_qs(query)
         file_path = params.get('file', [''])[0]
+        if not file_path:
+            raise FileNotFoundError(file_path)
         
-        if not file_path or not os.path.exists(file_path):
+        real = self.resolve_mount_path(file_path)
+        fd = os.open(real, os.O_RDONLY)
+        try:
+            # One fstat answers existence, type and size for the open file
+            st = os.fstat(fd)
+            if S_ISDIR(st.st_mode):
+                raise IsADirectoryError(real)
+        except OSError:
+            os.close(fd)
+            raise
+        return real, fd, st
+    
+    def recover_file(self, dest_dir, done_message):
+        try:
+            src_path, src_fd, src_stat = self.open_requested_file()
+        except PermissionError as e:
+            self.send_error(403, str(e))
+            return
+        except OSError:
             self.send_error(404, "File not found")
             return
         
         try:
-            os.makedirs(self.temp_path, exist_ok=True)
-            filename = os.path.basename(file_path)
-            dest_path = os.path.join(self.temp_path, filename)
-            shutil.copy2(file_path, dest_path)
+            os.makedirs(dest_dir, exist_ok=True)
+            filename = os.path.basename(src_path)
+            dest_path = os.path.join(dest_dir, filename)
+            _copy_file_with_metadata(src_fd, src_stat, src_path, dest_path)
             
+            body = f"{done_message} {filename}".encode()
             self.send_response(200)
             self.send_header('Content-type', 'text/plain')
+            self.send_header('Content-Length', str(len(body)))
             self.end_headers()
-            self.wfile.write(f"Temp copied {filename}".encode())
+            self.wfile.write(body)
             
         except Exception as e:
             self.send_error(500, str(e))
+        finally:
+            os.close(src_fd)
+    
+    def copy_file(self):
+        self.recover_file(self.recovery_path, "Copied")
+    
+    def copy_to_temp(self):
+        self.recover_file(self.temp_path, "Temp copied")
     
     def preview_file(self):
-        query = self.path.split('?', 1)[1] if '?' in self.path else ''
-        params = parse_qs(query)
-        file_path = params.get('file', [''])[0]
-        
-        if not file_path or not os.path.exists(file_path):
+        try:
+            _, fd, _ = self.open_requested_file()
+        except PermissionError as e:
+            self.send_error(403, str(e))
+            return
+        except OSError:
             self.send_error(404, "File not found")
             return
         
         try:
-            file_size = os.path.getsize(file_path)
-            if file_size > 1024 * 1024:
-                content = f"File too large to preview ({file_size/1024/1024:.1f} MB)"
-            else:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read(10000)
-                    if len(content) == 10000:
-                        content += "\\n\\n... (truncated)"
+            # One positioned read covers the preview and tells whether there is more
+            data = os.pread(fd, PREVIEW_BYTES + 1, 0)
+            truncated = len(data) > PREVIEW_BYTES
+            # The incremental decoder drops a character cut in half at the limit
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            content = decoder.decode(data[:PREVIEW_BYTES], final=not truncated)
+            if truncated:
+                content += "\n\n... (truncated)"
             
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain; charset=utf-8')
-            self.end_headers()
-            self.wfile.write(content.encode('utf-8', errors='replace'))
+            self.send_json({'text': content})
             
         except Exception as e:
             self.send_error(500, str(e))
+        finally:
+            os.close(fd)
     
     def unmount_current(self):
         try:
-            if os.path.ismount(self.mount_point):
-                subprocess.run(['borg', 'umount', self.mount_point], check=False)
-            self.current_mount = None
+            with self.server.mount_lock:
+                if os.path.ismount(self.mount_point):
+                    subprocess.run(['borg', 'umount', self.mount_point], check=False)
+                self.server.current_mount = None
             
             # Redirect to main page
             self.send_response(302)
             self.send_header('Location', '/')
+            self.send_header('Content-Length', '0')
             self.end_headers()
             
         except Exception as e:
@@ -605,7 +1074,7 @@ def main():
     handler = create_handler(repo_path, recovery_path, temp_path)
     
     try:
-        server = HTTPServer(('localhost', port), handler)
+        server = BackupBrowserServer(('localhost', port), handler)
         print(f"🗓️  Backup Date Browser started!")
         print(f"📂 Repository: {repo_path}")
         print(f"💾 Recovery: {recovery_path}")
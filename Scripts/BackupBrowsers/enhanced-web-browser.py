@@ -5,17 +5,394 @@ Enhanced web-based file browser with preview and temp copy features
 
 import os
 import sys
+import codecs
+import gzip
+import html
 import shutil
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import parse_qs, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qsl, quote, urlsplit
 import json
 from pathlib import Path
 import mimetypes
 import webbrowser
 import threading
 import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from string import Template
+
+# Worker threads serving connections; override with PIKA_MAX_HTTP_THREADS.
+# Each one is held for a whole keep-alive connection or event stream, not
+# a single request, so the floor stays high even on small machines
+DEFAULT_HTTP_THREADS = max(32, (os.cpu_count() or 1) * 4)
+# Seconds an idle keep-alive connection may hold a worker
+KEEPALIVE_TIMEOUT = 5
+
+# Buffer for copies the kernel can't do with sendfile
+COPY_BUFSIZE = 1 << 20
+
+# Previews show at most this many characters from the first PREVIEW_BUFSIZE bytes
+PREVIEW_CHARS = 10000
+PREVIEW_BUFSIZE = 1 << 16
+
+def _sendfile_copy(src, dst):
+    """Copy src to dst like shutil.copy2, moving the bytes in-kernel with sendfile"""
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            try:
+                size = os.fstat(src_fd).st_size
+                offset = 0
+                try:
+                    while offset < size:
+                        sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                        if sent == 0:
+                            break
+                        offset += sent
+                except OSError:
+                    # sendfile isn't supported here; copy through a large user-space buffer
+                    os.lseek(src_fd, 0, os.SEEK_SET)
+                    os.lseek(dst_fd, 0, os.SEEK_SET)
+                    os.ftruncate(dst_fd, 0)
+                    with open(src_fd, 'rb', closefd=False) as fsrc, open(dst_fd, 'wb', closefd=False) as fdst:
+                        shutil.copyfileobj(fsrc, fdst, COPY_BUFSIZE)
+            finally:
+                os.close(dst_fd)
+            shutil.copystat(src, dst)
+        except BaseException:
+            # Don't leave a truncated file behind
+            try:
+                os.unlink(dst)
+            except OSError:
+                pass
+            raise
+    finally:
+        os.close(src_fd)
+
+# Copies run in the background; /status reports on them by job id
+EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='copy')
+JOBS = {}
+JOBS_LOCK = threading.Lock()
+# Seconds a finished job waits to be polled before it is dropped
+JOB_TTL = 600
+
+# Parallel copies per /copy_tree request; pass workers=2 for a spinning disk
+TREE_COPY_WORKERS = 8
+
+# Listed directories keyed by (path, mtime_ns), most recently used last
+DIR_CACHE_SIZE = 256
+_dir_cache = OrderedDict()
+_dir_cache_lock = threading.Lock()
+
+def _cached_listing(full_path, build):
+    """Return the items for full_path, calling build() only when the directory has changed"""
+    key = (full_path, os.stat(full_path).st_mtime_ns)
+    with _dir_cache_lock:
+        items = _dir_cache.get(key)
+        if items is not None:
+            _dir_cache.move_to_end(key)
+            return items
+    
+    items = build()
+    
+    with _dir_cache_lock:
+        # A new mtime makes this directory's older listing, and those below it, suspect
+        stale = [k for k in _dir_cache if k[0] == full_path]
+        if stale:
+            prefix = full_path.rstrip(os.sep) + os.sep
+            stale += [k for k in _dir_cache if k[0].startswith(prefix)]
+        for k in stale:
+            del _dir_cache[k]
+        _dir_cache[key] = items
+        while len(_dir_cache) > DIR_CACHE_SIZE:
+            _dir_cache.popitem(last=False)
+    return items
+
+# Files the preview pane can show as text
+_TEXT_EXTS = frozenset({'.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml', '.yaml', '.yml',
+                        '.sh', '.bat', '.ps1', '.ini', '.cfg', '.conf', '.log', '.sql', '.csv'})
+_PREVIEW_BASENAMES = frozenset({'readme', 'license', 'changelog'})
+
+_UNITS = ('B', 'KB', 'MB', 'GB')
+
+def _format_size(size_bytes):
+    """Format a byte count with the largest binary unit it reaches"""
+    idx = min(max(0, (size_bytes.bit_length() - 1) // 10), len(_UNITS) - 1)
+    if idx == 0:
+        return f"{size_bytes} B"
+    return f"{size_bytes / (1 << (10 * idx)):.1f} {_UNITS[idx]}"
+
+def _accepted_encodings(header):
+    """Content codings named in an Accept-Encoding header, minus those sent with q=0"""
+    accepted = set()
+    for token in header.lower().split(','):
+        name, _, param = token.partition(';')
+        param = param.strip().replace(' ', '')
+        if param.startswith('q='):
+            try:
+                if float(param[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip())
+    return accepted
+
+def _js_arg(value):
+    """Quote value as a JS string literal that is safe inside a double-quoted attribute"""
+    return html.escape(json.dumps(value))
+
+# The landing page never changes, so it is encoded once
+_MAIN_PAGE_BYTES = ("""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Pika Backup Browser</title>
+        <style>
+            body { font-family: Arial, sans-serif; margin: 20px; }
+            .header { background: #2196F3; color: white; padding: 15px; border-radius: 5px; }
+            .directory { background: #f5f5f5; margin: 10px 0; padding: 10px; border-radius: 5px; }
+            .file-list { margin: 10px 0; }
+            .file-item { padding: 5px; border-bottom: 1px solid #eee; display: flex; justify-content: space-between; }
+            .file-item:hover { background: #f0f0f0; }
+            .directory-item { color: #2196F3; font-weight: bold; }
+            .file-size { color: #666; font-size: 0.9em; }
+            .copy-btn { background: #4CAF50; color: white; border: none; padding: 5px 10px; border-radius: 3px; cursor: pointer; margin: 2px; }
+            .temp-btn { background: #FF9800; color: white; border: none; padding: 5px 10px; border-radius: 3px; cursor: pointer; margin: 2px; }
+            .preview-btn { background: #9C27B0; color: white; border: none; padding: 5px 10px; border-radius: 3px; cursor: pointer; margin: 2px; }
+            .copy-btn:hover { background: #45a049; }
+            .temp-btn:hover { background: #e68900; }
+            .preview-btn:hover { background: #7B1FA2; }
+            .breadcrumb { margin: 10px 0; }
+            .breadcrumb a { color: #2196F3; text-decoration: none; margin-right: 5px; }
+            #status { margin: 10px 0; padding: 10px; background: #dff0d8; border-radius: 5px; display: none; }
+            #preview { margin: 10px 0; padding: 10px; background: #f9f9f9; border-radius: 5px; display: none; max-height: 400px; overflow: auto; }
+            .button-group { display: flex; gap: 5px; }
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>🐭 Pika Backup File Browser (Enhanced)</h1>
+            <p>Navigate, preview, and selectively copy your backup files</p>
+        </div>
+        
+        <div id="status"></div>
+        <div id="preview"></div>
+        
+        <div class="directory">
+            <h3>Quick Access:</h3>
+            <a href="/browse?path=Desktop">📁 Desktop</a> | 
+            <a href="/browse?path=Documents">📁 Documents</a> | 
+            <a href="/browse?path=Projects">📁 Projects</a> | 
+            <a href="/browse?path=Pictures">📁 Pictures</a> | 
+            <a href="/browse?path=Downloads">📁 Downloads</a> | 
+            <a href="/browse?path=Scripts">📁 Scripts</a> | 
+            <a href="/browse?path=">📁 Home Directory</a>
+        </div>
+        
+        <div id="content">
+            <p>Select a folder above to start browsing your backup files.</p>
+            <p><strong>New Features:</strong></p>
+            <ul>
+                <li><strong>Preview:</strong> View file contents without copying</li>
+                <li><strong>Temp Copy:</strong> Copy to ~/Desktop/TempPreview for quick access</li>
+                <li><strong>Permanent Copy:</strong> Copy to ~/Desktop/RecoveredFiles</li>
+            </ul>
+        </div>
+        
+        <script>
+            function copyFile(filePath, fileName) {
+                showStatus('Copying: ' + fileName);
+                fetch('/copy?file=' + encodeURIComponent(filePath))
+                .then(response => response.json())
+                .then(data => waitForJob(data.job, fileName, 'Permanently copied: ' + fileName + ' to RecoveredFiles/'));
+            }
+            
+            function tempCopy(filePath, fileName) {
+                showStatus('Copying: ' + fileName);
+                fetch('/temp?file=' + encodeURIComponent(filePath))
+                .then(response => response.json())
+                .then(data => waitForJob(data.job, fileName, 'Temp copied: ' + fileName + ' to TempPreview/'));
+            }
+            
+            function waitForJob(jobId, fileName, doneMessage) {
+                fetch('/status?id=' + jobId)
+                .then(response => response.json())
+                .then(job => {
+                    if (job.status === 'running') {
+                        setTimeout(() => waitForJob(jobId, fileName, doneMessage), 500);
+                    } else if (job.status === 'done') {
+                        showStatus(doneMessage);
+                    } else {
+                        showStatus('Error copying ' + fileName + ': ' + job.error);
+                    }
+                });
+            }
+            
+            function previewFile(filePath, fileName) {
+                fetch('/preview?file=' + encodeURIComponent(filePath))
+                .then(response => response.text())
+                .then(data => {
+                    document.getElementById('preview').style.display = 'block';
+                    showPreview(fileName, data);
+                });
+            }
+            
+            function showPreview(fileName, text) {
+                const heading = document.createElement('h3');
+                heading.textContent = 'Preview: ' + fileName;
+                const pre = document.createElement('pre');
+                pre.textContent = text;
+                document.getElementById('preview').replaceChildren(heading, pre);
+            }
+            
+            function showStatus(message) {
+                document.getElementById('status').style.display = 'block';
+                document.getElementById('status').textContent = message;
+                setTimeout(() => {
+                    document.getElementById('status').style.display = 'none';
+                }, 3000);
+            }
+        </script>
+    </body>
+    </html>
+    """).encode('utf-8')
+_MAIN_PAGE_LEN = str(len(_MAIN_PAGE_BYTES))
+
+# Listing page shell; only the location, breadcrumb and rows change per request
+_LISTING_PAGE = Template("""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Pika Backup Browser - $title</title>
+        <style>
+            body { font-family: Arial, sans-serif; margin: 20px; }
+            .header { background: #2196F3; color: white; padding: 15px; border-radius: 5px; }
+            .breadcrumb { margin: 10px 0; padding: 10px; background: #f5f5f5; border-radius: 5px; }
+            .breadcrumb a { color: #2196F3; text-decoration: none; margin-right: 5px; }
+            .file-list { margin: 10px 0; }
+            .file-item { padding: 8px; border-bottom: 1px solid #eee; display: flex; justify-content: space-between; align-items: center; }
+            .file-item:hover { background: #f0f0f0; }
+            .directory-item { color: #2196F3; font-weight: bold; }
+            .file-info { display: flex; align-items: center; }
+            .file-name { margin-right: 10px; }
+            .file-size { color: #666; font-size: 0.9em; margin-right: 20px; }
+            .copy-btn { background: #4CAF50; color: white; border: none; padding: 5px 8px; border-radius: 3px; cursor: pointer; margin: 2px; font-size: 0.9em; }
+            .temp-btn { background: #FF9800; color: white; border: none; padding: 5px 8px; border-radius: 3px; cursor: pointer; margin: 2px; font-size: 0.9em; }
+            .preview-btn { background: #9C27B0; color: white; border: none; padding: 5px 8px; border-radius: 3px; cursor: pointer; margin: 2px; font-size: 0.9em; }
+            .copy-btn:hover { background: #45a049; }
+            .temp-btn:hover { background: #e68900; }
+            .preview-btn:hover { background: #7B1FA2; }
+            .button-group { display: flex; gap: 2px; }
+            #status { margin: 10px 0; padding: 10px; background: #dff0d8; border-radius: 5px; display: none; }
+            #preview { margin: 10px 0; padding: 10px; background: #f9f9f9; border-radius: 5px; display: none; max-height: 400px; overflow: auto; }
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>🐭 Pika Backup File Browser</h1>
+            <p>Current location: /$location</p>
+        </div>
+        
+        <div id="status"></div>
+        <div id="preview"></div>
+        
+        <div class="breadcrumb">
+            $breadcrumb | <a href="/">🏠 Home</a>
+        </div>
+        
+        <div class="file-list">
+        $rows
+        </div>
+        
+        <script>
+            function copyFile(filePath, fileName) {
+                showStatus('Copying: ' + fileName);
+                fetch('/copy?file=' + encodeURIComponent(filePath))
+                .then(response => response.json())
+                .then(data => waitForJob(data.job, fileName, 'Permanently copied: ' + fileName + ' to RecoveredFiles/'));
+            }
+            
+            function tempCopy(filePath, fileName) {
+                showStatus('Copying: ' + fileName);
+                fetch('/temp?file=' + encodeURIComponent(filePath))
+                .then(response => response.json())
+                .then(data => waitForJob(data.job, fileName, 'Temp copied: ' + fileName + ' to TempPreview/ (auto-deleted on restart)'));
+            }
+            
+            function copyTree(path, dirName) {
+                const events = new EventSource('/copy_tree?path=' + encodeURIComponent(path));
+                events.onmessage = event => {
+                    const progress = JSON.parse(event.data);
+                    showStatus('Copying ' + dirName + ': ' + progress.done + '/' + progress.total + ' ' + progress.file);
+                };
+                events.addEventListener('done', event => {
+                    const result = JSON.parse(event.data);
+                    events.close();
+                    showStatus('Copied ' + (result.total - result.failed) + ' of ' + result.total + ' files to ' + result.dest);
+                });
+                events.onerror = () => {
+                    events.close();
+                    showStatus('Error copying folder: ' + dirName);
+                };
+            }
+            
+            function waitForJob(jobId, fileName, doneMessage) {
+                fetch('/status?id=' + jobId)
+                .then(response => response.json())
+                .then(job => {
+                    if (job.status === 'running') {
+                        setTimeout(() => waitForJob(jobId, fileName, doneMessage), 500);
+                    } else if (job.status === 'done') {
+                        showStatus(doneMessage);
+                    } else {
+                        showStatus('Error copying ' + fileName + ': ' + job.error);
+                    }
+                });
+            }
+            
+            function previewFile(filePath, fileName) {
+                fetch('/preview?file=' + encodeURIComponent(filePath))
+                .then(response => response.text())
+                .then(data => {
+                    document.getElementById('preview').style.display = 'block';
+                    showPreview(fileName, data);
+                    document.getElementById('preview').scrollIntoView();
+                })
+                .catch(error => {
+                    showStatus('Error previewing file: ' + fileName);
+                });
+            }
+            
+            function showPreview(fileName, text) {
+                const heading = document.createElement('h3');
+                heading.textContent = 'Preview: ' + fileName;
+                const pre = document.createElement('pre');
+                pre.style.whiteSpace = 'pre-wrap';
+                pre.style.wordWrap = 'break-word';
+                pre.textContent = text;
+                document.getElementById('preview').replaceChildren(heading, pre);
+            }
+            
+            function showStatus(message) {
+                document.getElementById('status').style.display = 'block';
+                document.getElementById('status').textContent = message;
+                setTimeout(() => {
+                    document.getElementById('status').style.display = 'none';
+                }, 4000);
+            }
+        </script>
+    </body>
+    </html>
+    """)
 
 class EnhancedBackupBrowserHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests; every response carries a length
+    protocol_version = 'HTTP/1.1'
+    # Buffer headers and body into one send
+    wbufsize = 1 << 16
+    timeout = KEEPALIVE_TIMEOUT
     
     def __init__(self, *args, backup_path=None, recovery_path=None, temp_path=None, **kwargs):
         self.backup_path = backup_path
@@ -24,125 +401,49 @@ class EnhancedBackupBrowserHandler(BaseHTTPRequestHandler):
         super().__init__(*args, **kwargs)
     
     def do_GET(self):
-        if self.path == '/':
+        # Split and parse once; the handlers below read self._query
+        url = urlsplit(self.path)
+        try:
+            self._query = dict(parse_qsl(url.query, max_num_fields=8))
+        except ValueError:
+            self.send_error(400, "Too many query parameters")
+            return
+        
+        route = url.path
+        if route == '/':
             self.serve_main_page()
-        elif self.path.startswith('/browse'):
+        elif route == '/browse':
             self.serve_directory_listing()
-        elif self.path.startswith('/copy'):
+        elif route == '/copy_tree':
+            self.copy_tree()
+        elif route == '/copy':
             self.copy_file()
-        elif self.path.startswith('/temp'):
+        elif route == '/temp':
             self.copy_to_temp()
-        elif self.path.startswith('/preview'):
+        elif route == '/preview':
             self.preview_file()
-        elif self.path.startswith('/download'):
+        elif route == '/download':
             self.download_file()
+        elif route == '/status':
+            self.job_status()
         else:
             self.send_error(404)
     
     def serve_main_page(self):
-        html = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Pika Backup Browser</title>
-            <style>
-                body { font-family: Arial, sans-serif; margin: 20px; }
-                .header { background: #2196F3; color: white; padding: 15px; border-radius: 5px; }
-                .directory { background: #f5f5f5; margin: 10px 0; padding: 10px; border-radius: 5px; }
-                .file-list { margin: 10px 0; }
-                .file-item { padding: 5px; border-bottom: 1px solid #eee; display: flex; justify-content: space-between; }
-                .file-item:hover { background: #f0f0f0; }
-                .directory-item { color: #2196F3; font-weight: bold; }
-                .file-size { color: #666; font-size: 0.9em; }
-                .copy-btn { background: #4CAF50; color: white; border: none; padding: 5px 10px; border-radius: 3px; cursor: pointer; margin: 2px; }
-                .temp-btn { background: #FF9800; color: white; border: none; padding: 5px 10px; border-radius: 3px; cursor: pointer; margin: 2px; }
-                .preview-btn { background: #9C27B0; color: white; border: none; padding: 5px 10px; border-radius: 3px; cursor: pointer; margin: 2px; }
-                .copy-btn:hover { background: #45a049; }
-                .temp-btn:hover { background: #e68900; }
-                .preview-btn:hover { background: #7B1FA2; }
-                .breadcrumb { margin: 10px 0; }
-                .breadcrumb a { color: #2196F3; text-decoration: none; margin-right: 5px; }
-                #status { margin: 10px 0; padding: 10px; background: #dff0d8; border-radius: 5px; display: none; }
-                #preview { margin: 10px 0; padding: 10px; background: #f9f9f9; border-radius: 5px; display: none; max-height: 400px; overflow: auto; }
-                .button-group { display: flex; gap: 5px; }
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>🐭 Pika Backup File Browser (Enhanced)</h1>
-                <p>Navigate, preview, and selectively copy your backup files</p>
-            </div>
-            
-            <div id="status"></div>
-            <div id="preview"></div>
-            
-            <div class="directory">
-                <h3>Quick Access:</h3>
-                <a href="/browse?path=Desktop">📁 Desktop</a> | 
-                <a href="/browse?path=Documents">📁 Documents</a> | 
-                <a href="/browse?path=Projects">📁 Projects</a> | 
-                <a href="/browse?path=Pictures">📁 Pictures</a> | 
-                <a href="/browse?path=Downloads">📁 Downloads</a> | 
-                <a href="/browse?path=Scripts">📁 Scripts</a> | 
-                <a href="/browse?path=">📁 Home Directory</a>
-            </div>
-            
-            <div id="content">
-                <p>Select a folder above to start browsing your backup files.</p>
-                <p><strong>New Features:</strong></p>
-                <ul>
-                    <li><strong>Preview:</strong> View file contents without copying</li>
-                    <li><strong>Temp Copy:</strong> Copy to ~/Desktop/TempPreview for quick access</li>
-                    <li><strong>Permanent Copy:</strong> Copy to ~/Desktop/RecoveredFiles</li>
-                </ul>
-            </div>
-            
-            <script>
-                function copyFile(filePath, fileName) {
-                    fetch('/copy?file=' + encodeURIComponent(filePath))
-                    .then(response => response.text())
-                    .then(data => showStatus('Permanently copied: ' + fileName + ' to RecoveredFiles/'));
-                }
-                
-                function tempCopy(filePath, fileName) {
-                    fetch('/temp?file=' + encodeURIComponent(filePath))
-                    .then(response => response.text())
-                    .then(data => showStatus('Temp copied: ' + fileName + ' to TempPreview/'));
-                }
-                
-                function previewFile(filePath, fileName) {
-                    fetch('/preview?file=' + encodeURIComponent(filePath))
-                    .then(response => response.text())
-                    .then(data => {
-                        document.getElementById('preview').style.display = 'block';
-                        document.getElementById('preview').innerHTML = '<h3>Preview: ' + fileName + '</h3><pre>' + data + '</pre>';
-                    });
-                }
-                
-                function showStatus(message) {
-                    document.getElementById('status').style.display = 'block';
-                    document.getElementById('status').innerHTML = message;
-                    setTimeout(() => {
-                        document.getElementById('status').style.display = 'none';
-                    }, 3000);
-                }
-            </script>
-        </body>
-        </html>
-        """
-        
         self.send_response(200)
-        self.send_header('Content-type', 'text/html')
+        self.send_header('Content-type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', _MAIN_PAGE_LEN)
         self.end_headers()
-        self.wfile.write(html.encode())
+        self.wfile.write(_MAIN_PAGE_BYTES)
     
     def serve_directory_listing(self):
         # Parse the path parameter
-        query = self.path.split('?', 1)[1] if '?' in self.path else ''
-        params = parse_qs(query)
-        rel_path = params.get('path', [''])[0]
+        rel_path = self._query.get('path', '')
         
-        full_path = os.path.join(self.backup_path, rel_path)
+        full_path = self.resolve_backup_path(rel_path)
+        if full_path is None:
+            self.send_error(403, "Outside the backup")
+            return
         
         if not os.path.exists(full_path):
             self.send_error(404, "Path not found")
@@ -161,169 +462,113 @@ class EnhancedBackupBrowserHandler(BaseHTTPRequestHandler):
                     'size': ''
                 })
             
-            # List directory contents
-            for item in sorted(os.listdir(full_path)):
-                if item.startswith('.'):
-                    continue
-                    
-                item_path = os.path.join(full_path, item)
-                rel_item_path = os.path.join(rel_path, item) if rel_path else item
-                
-                is_dir = os.path.isdir(item_path)
-                size = ''
-                
-                if not is_dir:
-                    try:
-                        size_bytes = os.path.getsize(item_path)
-                        if size_bytes < 1024:
-                            size = f"{size_bytes} B"
-                        elif size_bytes < 1024*1024:
-                            size = f"{size_bytes/1024:.1f} KB"
-                        elif size_bytes < 1024*1024*1024:
-                            size = f"{size_bytes/(1024*1024):.1f} MB"
-                        else:
-                            size = f"{size_bytes/(1024*1024*1024):.1f} GB"
-                    except:
-                        size = "Unknown"
+            # List directory contents; scandir entries carry their type, so only files get a stat.
+            # Only (name, is_dir, size) is cached: the same directory is reachable by several rel_paths.
+            def list_entries():
+                listing = []
+                with os.scandir(full_path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
                 
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    
+                    is_dir = entry.is_dir()
+                    size = ''
+                    
+                    # Directories show no size, so only files pay for a stat
+                    if not is_dir:
+                        try:
+                            size = _format_size(entry.stat().st_size)
+                        except OSError:
+                            size = "Unknown"  # e.g. a dangling symlink
+                    
+                    listing.append((entry.name, is_dir, size))
+                return listing
+            
+            for item, is_dir, size in _cached_listing(full_path, list_entries):
                 items.append({
                     'name': item,
                     'is_dir': is_dir,
-                    'path': rel_item_path,
-                    'full_path': item_path,
+                    'path': os.path.join(rel_path, item) if rel_path else item,
+                    'full_path': os.path.join(full_path, item),
                     'size': size
                 })
             
             # Generate HTML
             breadcrumb = self.generate_breadcrumb(rel_path)
+            location = html.escape(rel_path)
             
-            html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Pika Backup Browser - {rel_path or 'Home'}</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                    .header {{ background: #2196F3; color: white; padding: 15px; border-radius: 5px; }}
-                    .breadcrumb {{ margin: 10px 0; padding: 10px; background: #f5f5f5; border-radius: 5px; }}
-                    .breadcrumb a {{ color: #2196F3; text-decoration: none; margin-right: 5px; }}
-                    .file-list {{ margin: 10px 0; }}
-                    .file-item {{ padding: 8px; border-bottom: 1px solid #eee; display: flex; justify-content: space-between; align-items: center; }}
-                    .file-item:hover {{ background: #f0f0f0; }}
-                    .directory-item {{ color: #2196F3; font-weight: bold; }}
-                    .file-info {{ display: flex; align-items: center; }}
-                    .file-name {{ margin-right: 10px; }}
-                    .file-size {{ color: #666; font-size: 0.9em; margin-right: 20px; }}
-                    .copy-btn {{ background: #4CAF50; color: white; border: none; padding: 5px 8px; border-radius: 3px; cursor: pointer; margin: 2px; font-size: 0.9em; }}
-                    .temp-btn {{ background: #FF9800; color: white; border: none; padding: 5px 8px; border-radius: 3px; cursor: pointer; margin: 2px; font-size: 0.9em; }}
-                    .preview-btn {{ background: #9C27B0; color: white; border: none; padding: 5px 8px; border-radius: 3px; cursor: pointer; margin: 2px; font-size: 0.9em; }}
-                    .copy-btn:hover {{ background: #45a049; }}
-                    .temp-btn:hover {{ background: #e68900; }}
-                    .preview-btn:hover {{ background: #7B1FA2; }}
-                    .button-group {{ display: flex; gap: 2px; }}
-                    #status {{ margin: 10px 0; padding: 10px; background: #dff0d8; border-radius: 5px; display: none; }}
-                    #preview {{ margin: 10px 0; padding: 10px; background: #f9f9f9; border-radius: 5px; display: none; max-height: 400px; overflow: auto; }}
-                </style>
-            </head>
-            <body>
-                <div class="header">
-                    <h1>🐭 Pika Backup File Browser</h1>
-                    <p>Current location: /{rel_path}</p>
-                </div>
-                
-                <div id="status"></div>
-                <div id="preview"></div>
-                
-                <div class="breadcrumb">
-                    {breadcrumb} | <a href="/">🏠 Home</a>
-                </div>
-                
-                <div class="file-list">
-            """
+            rows = []
             
             for item in items:
+                name = html.escape(item['name'])
                 if item['is_dir']:
-                    html += f"""
+                    # The whole folder can be recovered in one go, except the parent link
+                    copy_button = f'<button class="copy-btn" onclick="copyTree({_js_arg(item["path"])}, {_js_arg(item["name"])})">Copy All</button>' if item['name'] != '..' else ''
+                    rows.append(f"""
                     <div class="file-item">
                         <div class="file-info">
-                            <a href="/browse?path={item['path']}" class="directory-item">📁 {item['name']}</a>
+                            <a href="/browse?path={html.escape(quote(item['path']))}" class="directory-item">📁 {name}</a>
                         </div>
+                        {copy_button}
                     </div>
-                    """
+                    """)
                 else:
                     # Determine if file can be previewed
                     can_preview = self.can_preview_file(item['name'])
-                    preview_button = f'<button class="preview-btn" onclick="previewFile(\'{item["full_path"]}\', \'{item["name"]}\')">Preview</button>' if can_preview else ''
+                    js_args = f"{_js_arg(item['full_path'])}, {_js_arg(item['name'])}"
+                    preview_button = f'<button class="preview-btn" onclick="previewFile({js_args})">Preview</button>' if can_preview else ''
                     
-                    html += f"""
+                    rows.append(f"""
                     <div class="file-item">
                         <div class="file-info">
-                            <span class="file-name">📄 {item['name']}</span>
+                            <span class="file-name">📄 {name}</span>
                             <span class="file-size">{item['size']}</span>
                         </div>
                         <div class="button-group">
                             {preview_button}
-                            <button class="temp-btn" onclick="tempCopy('{item['full_path']}', '{item['name']}')">Temp</button>
-                            <button class="copy-btn" onclick="copyFile('{item['full_path']}', '{item['name']}')">Copy</button>
+                            <button class="temp-btn" onclick="tempCopy({js_args})">Temp</button>
+                            <button class="copy-btn" onclick="copyFile({js_args})">Copy</button>
                         </div>
                     </div>
-                    """
+                    """)
             
-            html += """
-                </div>
-                
-                <script>
-                    function copyFile(filePath, fileName) {
-                        fetch('/copy?file=' + encodeURIComponent(filePath))
-                        .then(response => response.text())
-                        .then(data => showStatus('Permanently copied: ' + fileName + ' to RecoveredFiles/'));
-                    }
-                    
-                    function tempCopy(filePath, fileName) {
-                        fetch('/temp?file=' + encodeURIComponent(filePath))
-                        .then(response => response.text())
-                        .then(data => showStatus('Temp copied: ' + fileName + ' to TempPreview/ (auto-deleted on restart)'));
-                    }
-                    
-                    function previewFile(filePath, fileName) {
-                        fetch('/preview?file=' + encodeURIComponent(filePath))
-                        .then(response => response.text())
-                        .then(data => {
-                            document.getElementById('preview').style.display = 'block';
-                            document.getElementById('preview').innerHTML = '<h3>Preview: ' + fileName + '</h3><pre style="white-space: pre-wrap; word-wrap: break-word;">' + data + '</pre>';
-                            document.getElementById('preview').scrollIntoView();
-                        })
-                        .catch(error => {
-                            showStatus('Error previewing file: ' + fileName);
-                        });
-                    }
-                    
-                    function showStatus(message) {
-                        document.getElementById('status').style.display = 'block';
-                        document.getElementById('status').innerHTML = message;
-                        setTimeout(() => {
-                            document.getElementById('status').style.display = 'none';
-                        }, 4000);
-                    }
-                </script>
-            </body>
-            </html>
-            """
+            
+            data = _LISTING_PAGE.substitute(
+                title=location or 'Home',
+                location=location,
+                breadcrumb=breadcrumb,
+                rows=''.join(rows),
+            ).encode('utf-8')
+            # Listings are repetitive markup; fast gzip shrinks them several times over
+            gzipped = 'gzip' in _accepted_encodings(self.headers.get('Accept-Encoding', ''))
+            if gzipped:
+                data = gzip.compress(data, compresslevel=1)
             
             self.send_response(200)
-            self.send_header('Content-type', 'text/html')
+            self.send_header('Content-type', 'text/html; charset=utf-8')
+            if gzipped:
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Vary', 'Accept-Encoding')
+            self.send_header('Content-Length', str(len(data)))
             self.end_headers()
-            self.wfile.write(html.encode())
+            self.wfile.write(data)
             
         except Exception as e:
             self.send_error(500, str(e))
     
+    def resolve_backup_path(self, path):
+        """Canonicalize path against the backup root; None if it points outside"""
+        real = os.path.realpath(os.path.join(self.backup_path, path))
+        if os.path.commonpath([real, self.backup_path]) != self.backup_path:
+            return None
+        return real
+    
     def can_preview_file(self, filename):
         """Check if file can be previewed (text files, code, etc.)"""
-        text_extensions = {'.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml', '.yaml', '.yml', 
-                          '.sh', '.bat', '.ps1', '.ini', '.cfg', '.conf', '.log', '.sql', '.csv'}
-        _, ext = os.path.splitext(filename.lower())
-        return ext in text_extensions or filename.lower() in {'readme', 'license', 'changelog'}
+        name = filename.lower()
+        return os.path.splitext(name)[1] in _TEXT_EXTS or name in _PREVIEW_BASENAMES
     
     def generate_breadcrumb(self, path):
         if not path:
@@ -336,91 +581,262 @@ class EnhancedBackupBrowserHandler(BaseHTTPRequestHandler):
             if part:
                 partial_path = '/'.join(parts[:i+1])
                 if i == len(parts) - 1:
-                    breadcrumb += f'<strong>{part}</strong>'
+                    breadcrumb += f'<strong>{html.escape(part)}</strong>'
                 else:
-                    breadcrumb += f'<a href="/browse?path={partial_path}">{part}</a> > '
+                    breadcrumb += f'<a href="/browse?path={html.escape(quote(partial_path))}">{html.escape(part)}</a> > '
         
         return breadcrumb
     
     def copy_file(self):
-        query = self.path.split('?', 1)[1] if '?' in self.path else ''
-        params = parse_qs(query)
-        file_path = params.get('file', [''])[0]
+        file_path = self._query.get('file', '')
         
-        if not file_path or not os.path.exists(file_path):
+        if file_path:
+            file_path = self.resolve_backup_path(file_path)
+            if file_path is None:
+                self.send_error(403, "Outside the backup")
+                return
+        
+        if not file_path or not os.path.isfile(file_path):
             self.send_error(404, "File not found")
             return
         
         try:
-            os.makedirs(self.recovery_path, exist_ok=True)
-            filename = os.path.basename(file_path)
-            dest_path = os.path.join(self.recovery_path, filename)
-            shutil.copy2(file_path, dest_path)
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(f"Copied {filename} to {dest_path}".encode())
-            
+            self.start_copy(file_path, self.recovery_path, "Copied")
         except Exception as e:
             self.send_error(500, str(e))
     
     def copy_to_temp(self):
-        query = self.path.split('?', 1)[1] if '?' in self.path else ''
-        params = parse_qs(query)
-        file_path = params.get('file', [''])[0]
+        file_path = self._query.get('file', '')
         
-        if not file_path or not os.path.exists(file_path):
+        if file_path:
+            file_path = self.resolve_backup_path(file_path)
+            if file_path is None:
+                self.send_error(403, "Outside the backup")
+                return
+        
+        if not file_path or not os.path.isfile(file_path):
             self.send_error(404, "File not found")
             return
         
         try:
-            os.makedirs(self.temp_path, exist_ok=True)
-            filename = os.path.basename(file_path)
-            dest_path = os.path.join(self.temp_path, filename)
-            shutil.copy2(file_path, dest_path)
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(f"Temp copied {filename} to {dest_path}".encode())
-            
+            self.start_copy(file_path, self.temp_path, "Temp copied")
         except Exception as e:
             self.send_error(500, str(e))
     
+    def start_copy(self, file_path, dest_dir, verb):
+        os.makedirs(dest_dir, exist_ok=True)
+        filename = os.path.basename(file_path)
+        dest_path = os.path.join(dest_dir, filename)
+        
+        job_id = uuid.uuid4().hex
+        job = {'message': f"{verb} {filename} to {dest_path}", 'finished': None}
+        with JOBS_LOCK:
+            # Jobs whose page went away are never polled; drop them once they go stale
+            now = time.monotonic()
+            for stale in [jid for jid, j in JOBS.items() if j['finished'] and now - j['finished'] > JOB_TTL]:
+                del JOBS[stale]
+            JOBS[job_id] = job
+        job['future'] = future = EXECUTOR.submit(_sendfile_copy, file_path, dest_path)
+        future.add_done_callback(lambda _: job.update(finished=time.monotonic()))
+        self.send_json(202, {'job': job_id})
+    
+    def job_status(self):
+        job_id = self._query.get('id', '')
+        
+        with JOBS_LOCK:
+            job = JOBS.get(job_id)
+            # A finished job is reported once, then forgotten
+            if job is not None and job['finished']:
+                del JOBS[job_id]
+        
+        if job is None:
+            self.send_error(404, "Unknown job")
+            return
+        future = job.get('future')
+        if future is None or not future.done():
+            status = {'status': 'running'}
+        elif future.exception() is not None:
+            status = {'status': 'error', 'error': str(future.exception())}
+        else:
+            status = {'status': 'done', 'message': job['message']}
+        self.send_json(200, status)
+    
+    def copy_tree(self):
+        rel_path = self._query.get('path', '')
+        try:
+            workers = max(1, min(int(self._query.get('workers', TREE_COPY_WORKERS)), 32))
+        except ValueError:
+            workers = TREE_COPY_WORKERS
+        
+        src_root = self.resolve_backup_path(rel_path)
+        if src_root is None:
+            self.send_error(403, "Outside the backup")
+            return
+        if not os.path.isdir(src_root):
+            self.send_error(404, "Path not found")
+            return
+        dest_root = os.path.join(self.recovery_path, os.path.basename(os.path.normpath(src_root)))
+        
+        # Recreate the directories up front so the copies can run in any order
+        try:
+            pairs = []
+            pending = [(src_root, dest_root)]
+            while pending:
+                src_dir, dest_dir = pending.pop()
+                os.makedirs(dest_dir, exist_ok=True)
+                with os.scandir(src_dir) as it:
+                    for entry in it:
+                        dest = os.path.join(dest_dir, entry.name)
+                        if entry.is_symlink():
+                            # Recover the link as backed up; its target may be outside the backup
+                            if os.path.lexists(dest):
+                                os.remove(dest)
+                            os.symlink(os.readlink(entry.path), dest)
+                        elif entry.is_dir(follow_symlinks=False):
+                            pending.append((entry.path, dest))
+                        elif entry.is_file(follow_symlinks=False):
+                            pairs.append((entry.path, dest))
+        except OSError as e:
+            self.send_error(500, str(e))
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        # The stream has no length, so closing the connection ends it
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        
+        total = len(pairs)
+        failed = 0
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tree')
+        try:
+            futures = {pool.submit(_sendfile_copy, src, dest): src for src, dest in pairs}
+            for done, future in enumerate(as_completed(futures), 1):
+                progress = {'done': done, 'total': total, 'file': os.path.relpath(futures[future], src_root)}
+                if future.exception() is not None:
+                    failed += 1
+                    progress['error'] = str(future.exception())
+                self.send_event(progress)
+            self.send_event({'total': total, 'failed': failed, 'dest': dest_root}, 'done')
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Page closed; copies that haven't started are dropped
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def send_event(self, payload, event=None):
+        message = f"data: {json.dumps(payload)}\n\n"
+        if event:
+            message = f"event: {event}\n" + message
+        self.wfile.write(message.encode('utf-8'))
+        self.wfile.flush()
+    
+    def send_json(self, code, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
     def preview_file(self):
-        query = self.path.split('?', 1)[1] if '?' in self.path else ''
-        params = parse_qs(query)
-        file_path = params.get('file', [''])[0]
+        file_path = self._query.get('file', '')
+        
+        if file_path:
+            file_path = self.resolve_backup_path(file_path)
+            if file_path is None:
+                self.send_error(403, "Outside the backup")
+                return
         
         if not file_path or not os.path.exists(file_path):
             self.send_error(404, "File not found")
             return
         
         try:
-            # Check file size (limit preview to reasonable size)
-            file_size = os.path.getsize(file_path)
-            if file_size > 1024 * 1024:  # 1MB limit
-                content = f"File too large to preview ({file_size/1024/1024:.1f} MB). Use Temp or Copy instead."
-            else:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read(10000)  # First 10k characters
-                    if len(content) == 10000:
-                        content += "\n\n... (truncated - showing first 10,000 characters)"
+            # One bounded read, whatever the file size
+            with open(file_path, 'rb', buffering=0) as f:
+                raw = f.read(PREVIEW_BUFSIZE)
             
+            # The incremental decoder holds back a character split by the read limit
+            text = codecs.getincrementaldecoder('utf-8')('replace').decode(raw)
+            content = text[:PREVIEW_CHARS]
+            if len(text) > PREVIEW_CHARS or len(raw) == PREVIEW_BUFSIZE:
+                content += f"\n\n... (truncated - showing first {len(content):,} characters)"
+            
+            data = content.encode('utf-8', errors='replace')
             self.send_response(200)
             self.send_header('Content-type', 'text/plain; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
             self.end_headers()
-            self.wfile.write(content.encode('utf-8', errors='replace'))
+            self.wfile.write(data)
             
         except Exception as e:
             self.send_error(500, str(e))
+    
+    def download_file(self):
+        file_path = self._query.get('file', '')
+        
+        if file_path:
+            file_path = self.resolve_backup_path(file_path)
+            if file_path is None:
+                self.send_error(403, "Outside the backup")
+                return
+        
+        if not file_path or not os.path.isfile(file_path):
+            self.send_error(404, "File not found")
+            return
+        
+        try:
+            f = open(file_path, 'rb')
+        except OSError as e:
+            self.send_error(500, str(e))
+            return
+        
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+            filename = os.path.basename(file_path)
+            
+            self.send_response(200)
+            self.send_header('Content-type', content_type)
+            self.send_header('Content-Length', str(size))
+            self.send_header('Content-Disposition', f"attachment; filename*=UTF-8''{quote(filename)}")
+            self.end_headers()
+            self.wfile.flush()
+            
+            try:
+                # socket.sendfile hands the file to the kernel (falling back to send() itself)
+                self.connection.sendfile(f)
+            except OSError:
+                # Cancelled, or stalled past the socket timeout; the body is cut short, so
+                # the connection can't carry another response
+                self.close_connection = True
 
 def create_handler(backup_path, recovery_path, temp_path):
+    # Canonical once, so every request compares resolved paths against it
+    backup_path = os.path.realpath(backup_path)
+    
     def handler(*args, **kwargs):
         return EnhancedBackupBrowserHandler(*args, backup_path=backup_path, recovery_path=recovery_path, temp_path=temp_path, **kwargs)
     return handler
 
+class EnhancedBrowserServer(ThreadingHTTPServer):
+    """Threaded HTTP server that reuses a fixed pool of worker threads"""
+    
+    def __init__(self, server_address, handler_class, max_workers=None):
+        super().__init__(server_address, handler_class)
+        if max_workers is None:
+            max_workers = int(os.environ.get('PIKA_MAX_HTTP_THREADS') or DEFAULT_HTTP_THREADS)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='http')
+    
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+    
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+
 def main():
     backup_path = "/home/herb/pika-browse/home/herb"
     recovery_path = "/home/herb/Desktop/RecoveredFiles"
@@ -438,7 +854,7 @@ def main():
     handler = create_handler(backup_path, recovery_path, temp_path)
     
     try:
-        server = HTTPServer(('localhost', port), handler)
+        server = EnhancedBrowserServer(('localhost', port), handler)
         print(f"🌐 Enhanced Web File Browser started!")
         print(f"📂 Backup path: {backup_path}")
         print(f"💾 Recovery path: {recovery_path}")
@@ -14,15 +14,20 @@ import threading
 import time
 from datetime import datetime
 
+# Seconds a parsed `borg list` is reused before asking borg again
+ARCHIVE_CACHE_TTL = 60
+
 class FullBackupBrowserHandler(BaseHTTPRequestHandler):
+    # A handler is built per request, so shared settings and state live on the class
+    repo_path = "/media/herb/Linux_Drive_2/PikaBackups/From_2502-07-11"
+    recovery_path = "/home/herb/Desktop/RecoveredFiles"
+    temp_path = "/home/herb/Desktop/TempPreview"
+    mount_point = "/home/herb/full-backup-mount"
+    current_archive = None
     
-    def __init__(self, *args, **kwargs):
-        self.repo_path = "/media/herb/Linux_Drive_2/PikaBackups/From_2502-07-11"
-        self.recovery_path = "/home/herb/Desktop/RecoveredFiles"
-        self.temp_path = "/home/herb/Desktop/TempPreview"
-        self.mount_point = "/home/herb/full-backup-mount"
-        self.current_archive = None
-        super().__init__(*args, **kwargs)
+    # Archives newest first, plus name -> date for the listing header
+    _archive_cache = {'ts': 0, 'data': [], 'by_name': {}}
+    _archive_cache_lock = threading.Lock()
     
     def do_GET(self):
         if self.path == '/':
@@ -41,26 +46,41 @@ class FullBackupBrowserHandler(BaseHTTPRequestHandler):
             self.send_error(404)
     
     def get_all_archives(self):
-        """Get complete archive list"""
-        try:
-            result = subprocess.run(
-                ['bash', '-c', f'echo "y" | borg list "{self.repo_path}"'],
-                capture_output=True, text=True, check=False
-            )
-            
-            archives = []
-            for line in result.stdout.strip().split('\n'):
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        archive_name = parts[0]
-                        date_str = f"{parts[2]} {parts[3]}"
-                        archives.append((archive_name, date_str))
+        """Get complete archive list, reusing a recent `borg list`"""
+        cache = self._archive_cache
+        with self._archive_cache_lock:
+            if cache['ts'] and time.monotonic() - cache['ts'] < ARCHIVE_CACHE_TTL:
+                return cache['data']
             
-            return list(reversed(archives))  # Most recent first
+            try:
+                result = subprocess.run(
+                    ['bash', '-c', f'echo "y" | borg list "{self.repo_path}"'],
+                    capture_output=True, text=True, check=False
+                )
+                
+                archives = []
+                for line in result.stdout.strip().split('\n'):
+                    if line.strip():
+                        parts = line.split()
+                        if len(parts) >= 4:
+                            archive_name = parts[0]
+                            date_str = f"{parts[2]} {parts[3]}"
+                            archives.append((archive_name, date_str))
+                
+                archives.reverse()  # Most recent first
+                
+            except:
+                return []
             
-        except:
-            return []
+            # A failed listing (e.g. repository locked) is retried on the next request
+            if result.returncode == 0:
+                cache.update(ts=time.monotonic(), data=archives, by_name=dict(archives))
+            return archives
+    
+    def get_archive_date(self, archive_name):
+        """Backup date of one archive, from the cached archive list"""
+        self.get_all_archives()
+        return self._archive_cache['by_name'].get(archive_name, "Unknown")
     
     def serve_main_page(self):
         archives = self.get_all_archives()
@@ -190,7 +210,7 @@ class FullBackupBrowserHandler(BaseHTTPRequestHandler):
         sub_path = '/'.join(path_parts[1:]) if len(path_parts) > 1 else ''
         
         # Mount archive if different from current
-        if self.current_archive != archive_name:
+        if self.current_archive != archive_name or not os.path.ismount(self.mount_point):
             if not self.mount_archive(archive_name):
                 self.send_error(500, "Failed to mount archive")
                 return
@@ -225,7 +245,7 @@ class FullBackupBrowserHandler(BaseHTTPRequestHandler):
             )
             
             if result.returncode == 0:
-                self.current_archive = archive_name
+                FullBackupBrowserHandler.current_archive = archive_name
                 return True
             else:
                 print(f"Mount failed: {result.stderr}")
@@ -362,18 +382,7 @@ class FullBackupBrowserHandler(BaseHTTPRequestHandler):
                     """
             
             # Get archive date for display
-            archive_date = "Unknown"
-            try:
-                result = subprocess.run(
-                    ['bash', '-c', f'echo "y" | borg list "{self.repo_path}" | grep "{archive_name}"'],
-                    capture_output=True, text=True, check=False
-                )
-                if result.stdout.strip():
-                    parts = result.stdout.strip().split()
-                    if len(parts) >= 4:
-                        archive_date = f"{parts[2]} {parts[3]}"
-            except:
-                pass
+            archive_date = self.get_archive_date(archive_name)
             
             html = f"""
             <!DOCTYPE html>
@@ -557,7 +566,7 @@ class FullBackupBrowserHandler(BaseHTTPRequestHandler):
         try:
             if os.path.ismount(self.mount_point):
                 subprocess.run(['borg', 'umount', self.mount_point], check=False)
-            self.current_archive = None
+            FullBackupBrowserHandler.current_archive = None
             
             self.send_response(302)
             self.send_header('Location', '/')